@@ -0,0 +1,357 @@
+# Attribution automatique des VLANs et adresses IP des nouveaux sites
+# Les valeurs déjà utilisées par l'inventaire sont chargées dans des structures compactes :
+# une table de bits de 4094 VLANs par segment Metro, une liste triée d'intervalles libres par sous-réseau /26.
+import argparse                     # Pour l'interface en ligne de commande
+import csv                          # Pour écrire l'inventaire complété
+import heapq                        # Sous-réseaux ayant encore des adresses libres
+import sys                          # Pour les sorties d'erreur et le code de retour
+from bisect import bisect_right     # Recherche de l'intervalle libre contenant une adresse
+
+from bulk import load_inventory
+from generation import fields_2g3g, fields_4g, TECHNOLOGIES
+from validation import IP_FIELDS, METRO_VLANS, SEGMENT_FIELD, format_ip, parse_ip, parse_vlan
+
+SUBNET_PREFIX = 26                  # Masque 255.255.255.192 des interfaces Abis et SIU_OM (voir templates.py)
+BLOCK_SIZE = 1 << (32 - SUBNET_PREFIX)  # Nombre d'adresses d'un /26
+FIRST_VLAN = 2                      # Le VLAN 1 (VLAN par défaut) n'est jamais attribué automatiquement
+LAST_VLAN = 4094
+
+
+def parse_subnet(cidr):
+    """
+    Convertit un sous-réseau "a.b.c.d/n" en (adresse réseau, longueur du préfixe).
+    Raises:
+        ValueError: Si le sous-réseau est invalide.
+    """
+    address, _, prefix = cidr.partition("/")
+    network = parse_ip(address)
+    if network is None or not prefix.isdigit() or not 0 < int(prefix) <= 30:
+        raise ValueError(f"Sous-réseau invalide : {cidr}")
+    prefix = int(prefix)
+    mask = (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF
+    return network & mask, prefix
+
+
+class VlanBitmap:
+    """
+    Table de bits des VLANs 1 à 4094 d'un domaine, sur deux niveaux : 64 mots de 64 bits,
+    et un mot de synthèse dont le bit w indique que le mot w est plein. Réservation, test et
+    recherche du premier VLAN libre se font en temps constant.
+    """
+    __slots__ = ("_words", "_full")
+
+    def __init__(self):
+        self._words = [0] * 64
+        self._full = 0
+        for vlan in range(0, FIRST_VLAN):
+            self.reserve(vlan)      # VLAN 0 (invalide) et VLAN par défaut
+        for vlan in range(LAST_VLAN + 1, 4096):
+            self.reserve(vlan)      # VLAN 4095 (réservé)
+
+    def is_free(self, vlan):
+        """Indique si un VLAN est libre."""
+        return not (self._words[vlan >> 6] >> (vlan & 63)) & 1
+
+    def reserve(self, vlan):
+        """Marque un VLAN comme utilisé."""
+        index = vlan >> 6
+        word = self._words[index] = self._words[index] | (1 << (vlan & 63))
+        if word == 0xFFFFFFFFFFFFFFFF:
+            self._full |= 1 << index
+
+    def allocate(self):
+        """
+        Attribue le plus petit VLAN libre.
+        Returns:
+            int: VLAN attribué, ou None si le domaine est plein.
+        """
+        if self._full == 0xFFFFFFFFFFFFFFFF:
+            return None
+        index = (~self._full & (self._full + 1)).bit_length() - 1   # Premier mot non plein
+        word = self._words[index]
+        vlan = (index << 6) + (~word & (word + 1)).bit_length() - 1  # Premier bit libre du mot
+        self.reserve(vlan)
+        return vlan
+
+
+class SiteVlans:
+    """
+    VLANs d'un site sans segment Metro : au plus quelques valeurs, un simple ensemble suffit.
+    Mêmes méthodes que VlanBitmap.
+    Args:
+        vlans (iterable): VLANs déjà utilisés par le site.
+    """
+    __slots__ = ("_used",)
+
+    def __init__(self, vlans=()):
+        self._used = set(vlans)
+
+    def is_free(self, vlan):
+        """Indique si un VLAN est libre."""
+        return FIRST_VLAN <= vlan <= LAST_VLAN and vlan not in self._used
+
+    def reserve(self, vlan):
+        """Marque un VLAN comme utilisé."""
+        self._used.add(vlan)
+
+    def allocate(self):
+        """
+        Attribue le plus petit VLAN libre.
+        Returns:
+            int: VLAN attribué, ou None si le domaine est plein.
+        """
+        vlan = FIRST_VLAN
+        while vlan in self._used:
+            vlan += 1
+        if vlan > LAST_VLAN:
+            return None
+        self._used.add(vlan)
+        return vlan
+
+
+class SubnetPool:
+    """
+    Adresses libres d'un sous-réseau, sous forme de liste triée d'intervalles [début, fin] disjoints.
+    L'adresse réseau, l'adresse de diffusion et la première adresse (passerelle) sont réservées.
+    Args:
+        network (int): Adresse réseau (entier 32 bits).
+        prefix (int): Longueur du préfixe (26 pour un /26).
+    """
+    __slots__ = ("network", "prefix", "_starts", "_ends")
+
+    def __init__(self, network, prefix=SUBNET_PREFIX):
+        self.network = network
+        self.prefix = prefix
+        size = 1 << (32 - prefix)
+        self._starts = [network + 2]            # network + 1 : passerelle (ex. 172.27.162.65)
+        self._ends = [network + size - 2]       # network + size - 1 : diffusion
+
+    @property
+    def free(self):
+        """Nombre d'adresses encore libres."""
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def reserve(self, ip):
+        """Retire une adresse des intervalles libres (sans effet si elle est déjà utilisée)."""
+        index = bisect_right(self._starts, ip) - 1
+        if index < 0 or ip > self._ends[index]:
+            return
+        start, end = self._starts[index], self._ends[index]
+        if start == end:
+            del self._starts[index], self._ends[index]
+        elif ip == start:
+            self._starts[index] = ip + 1
+        elif ip == end:
+            self._ends[index] = ip - 1
+        else:
+            self._ends[index] = ip - 1
+            self._starts.insert(index + 1, ip + 1)
+            self._ends.insert(index + 1, end)
+
+    def allocate(self):
+        """
+        Attribue la plus petite adresse libre.
+        Returns:
+            int: Adresse attribuée, ou None si le sous-réseau est plein.
+        """
+        if not self._starts:
+            return None
+        ip = self._starts[0]
+        self.reserve(ip)
+        return ip
+
+
+class Allocator:
+    """
+    Attribue des VLANs et des adresses IP libres aux sites qui n'en ont pas.
+    Les VLANs du groupe Metro sont uniques par segment Metro (colonne metro_segment) ou, à défaut,
+    au sein du site. Chaque champ IP puise dans ses propres sous-réseaux /26 ; une adresse déjà
+    utilisée, quel que soit le champ, n'est jamais réattribuée.
+    """
+
+    def __init__(self):
+        self.domains = {}           # Segment Metro -> VlanBitmap
+        self.pools = {}             # Adresse réseau d'un /26 -> SubnetPool (créé à la première utilisation)
+        # Champ IP -> tas des plages non épuisées (premier /26 non plein, fin de la plage)
+        self._available = {name: [] for name in IP_FIELDS}
+        self._registered = {name: set() for name in IP_FIELDS}  # (réseau, préfixe) déjà déclarés
+
+    def add_subnet(self, field, cidr):
+        """
+        Déclare un sous-réseau dans lequel attribuer les adresses d'un champ IP. Un sous-réseau plus large
+        qu'un /26 est découpé en /26 (masque des interfaces), chacun avec sa propre passerelle réservée ;
+        les adresses existantes y sont donc réservées quel que soit le sous-réseau déclaré.
+        Les /26 ne sont créés qu'au fur et à mesure des attributions : déclarer un /8 ne coûte rien.
+        Args:
+            field (str): Champ IP ("ABIS_primary_ip" ou "SIU_OM_primary_ip").
+            cidr (str): Sous-réseau, par exemple "172.27.162.64/26" ou "172.27.162.0/24".
+        Raises:
+            ValueError: Si le champ est inconnu ou le sous-réseau invalide ou plus petit qu'un /26.
+        """
+        if field not in self._available:
+            raise ValueError(f"Champ IP inconnu : {field}")
+        network, prefix = parse_subnet(cidr)
+        if prefix > SUBNET_PREFIX:
+            raise ValueError(f"Sous-réseau trop petit : {cidr} (les interfaces utilisent un /{SUBNET_PREFIX})")
+        if (network, prefix) not in self._registered[field]:
+            self._registered[field].add((network, prefix))
+            heapq.heappush(self._available[field], (network, network + (1 << (32 - prefix))))
+
+    def _pool(self, network):
+        """Retourne le /26 d'adresse réseau donnée, créé à la première utilisation."""
+        pool = self.pools.get(network)
+        if pool is None:
+            pool = self.pools[network] = SubnetPool(network)
+        return pool
+
+    @staticmethod
+    def _site_vlans(site):
+        """VLANs du groupe Metro déjà renseignés d'un site."""
+        for names in METRO_VLANS.values():
+            for name in names:
+                vlan = parse_vlan(site.get(name, ""))
+                if vlan is not None:
+                    yield vlan
+
+    def _domain(self, site):
+        """
+        Retourne les VLANs utilisés du domaine d'un site : la table de son segment Metro, ou, sans segment,
+        un ensemble reconstruit à partir des seules valeurs du site (rien n'est conservé entre deux sites).
+        """
+        segment = site.get(SEGMENT_FIELD)
+        if not segment:
+            return SiteVlans(self._site_vlans(site))
+        bitmap = self.domains.get(segment)
+        if bitmap is None:
+            bitmap = self.domains[segment] = VlanBitmap()
+        return bitmap
+
+    def reserve_site(self, line_no, site):
+        """
+        Enregistre les VLANs et adresses déjà renseignés d'un site. Le sous-réseau /26 de chaque
+        adresse existante devient disponible pour les nouveaux sites du même champ.
+        """
+        if site.get(SEGMENT_FIELD):
+            bitmap = self._domain(site)
+            for vlan in self._site_vlans(site):
+                bitmap.reserve(vlan)
+        for name in IP_FIELDS:
+            ip = parse_ip(site.get(name, ""))
+            if ip is not None:
+                network = ip & (0xFFFFFFFF << (32 - SUBNET_PREFIX)) & 0xFFFFFFFF
+                self.add_subnet(name, f"{format_ip(network)}/{SUBNET_PREFIX}")
+                self._pool(network).reserve(ip)
+
+    def allocate_ip(self, field):
+        """
+        Attribue une adresse libre pour un champ IP (sous-réseau de plus petite adresse en premier).
+        Returns:
+            str: Adresse attribuée, ou None si tous les sous-réseaux du champ sont pleins.
+        """
+        heap = self._available[field]
+        while heap:
+            network, stop = heap[0]
+            ip = self._pool(network).allocate()
+            if ip is not None:
+                return format_ip(ip)
+            if network + BLOCK_SIZE < stop:
+                heapq.heapreplace(heap, (network + BLOCK_SIZE, stop))  # /26 plein : passe au suivant de la plage
+            else:
+                heapq.heappop(heap)  # Plage épuisée : retirée définitivement
+        return None
+
+    def fill_site(self, line_no, site, techno):
+        """
+        Complète les VLANs et adresses IP manquants d'un site (les valeurs présentes sont conservées).
+        Args:
+            line_no (int): Numéro de ligne du site.
+            site (dict): Site à compléter (modifié sur place).
+            techno (str): Technologie du site.
+        Returns:
+            list: Champs qui n'ont pas pu être attribués (domaine ou sous-réseaux pleins).
+        """
+        missing = []
+        bitmap = self._domain(site)
+        for group, names in METRO_VLANS.items():
+            if techno not in (group, "Les trois"):
+                continue
+            for name in names:
+                if not site.get(name):
+                    vlan = bitmap.allocate()
+                    site[name] = str(vlan) if vlan is not None else ""
+                    if vlan is None:
+                        missing.append(name)
+        if techno in ("2G/3G", "Les trois"):
+            for name in IP_FIELDS:
+                if not site.get(name):
+                    site[name] = self.allocate_ip(name) or ""
+                    if not site[name]:
+                        missing.append(name)
+        return missing
+
+
+def allocate_inventory(inventory_path, techno="Les trois", subnets=(), errors=None):
+    """
+    Complète un inventaire en deux lectures successives du fichier (mémoire constante) :
+    la première réserve toutes les valeurs existantes, la seconde attribue les valeurs manquantes.
+    Args:
+        inventory_path (str): Inventaire (.csv ou .jsonl).
+        techno (str): Technologie par défaut.
+        subnets (iterable): Couples (champ IP, sous-réseau) supplémentaires pour les attributions.
+        errors (list): Reçoit les lignes illisibles de l'inventaire (voir bulk.load_inventory), qui sont ignorées.
+    Yields:
+        tuple: (numéro de ligne, site complété, champs non attribués).
+    """
+    allocator = Allocator()
+    for field, cidr in subnets:
+        allocator.add_subnet(field, cidr)
+    for line_no, site in load_inventory(inventory_path, [] if errors is not None else None):
+        allocator.reserve_site(line_no, site)
+    for line_no, site in load_inventory(inventory_path, errors):
+        missing = allocator.fill_site(line_no, site, site.get("techno") or techno)
+        yield line_no, site, missing
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : python allocator.py inventaire.csv -o inventaire_complet.csv"""
+    parser = argparse.ArgumentParser(description="Attribue les VLANs et adresses IP manquants d'un inventaire.")
+    parser.add_argument("inventory", help="Inventaire des sites (.csv ou .jsonl)")
+    parser.add_argument("-o", "--output", required=True, help="Inventaire complété (.csv)")
+    parser.add_argument("-t", "--techno", default="Les trois", choices=TECHNOLOGIES, help="Technologie par défaut")
+    parser.add_argument("--subnet", action="append", default=[], metavar="CHAMP=RÉSEAU/PRÉFIXE",
+                        help="Sous-réseau disponible pour un champ IP, découpé en /26 "
+                             "(ex. SIU_OM_primary_ip=172.27.162.0/24)")
+    args = parser.parse_args(argv)
+
+    subnets = []
+    for item in args.subnet:
+        field, sep, cidr = item.partition("=")
+        if not sep:
+            parser.error(f"--subnet invalide : {item} (attendu CHAMP=RÉSEAU/PRÉFIXE)")
+        subnets.append((field, cidr))
+
+    failures = 0
+    read_errors = []
+    try:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = None
+            for line_no, site, missing in allocate_inventory(args.inventory, args.techno, subnets, read_errors):
+                if writer is None:
+                    columns = list(dict.fromkeys(list(site) + fields_2g3g + fields_4g))
+                    writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(site)
+                if missing:
+                    failures += 1
+                    print(f"Ligne {line_no} ({site.get('nom_station') or '?'}) : aucune valeur libre pour "
+                          f"{', '.join(missing)}", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    for error in read_errors:
+        print(f"Ligne {error.line} : {error.message} (ligne ignorée)", file=sys.stderr)
+    return 1 if failures or read_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
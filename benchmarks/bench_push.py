@@ -0,0 +1,58 @@
+# Benchmark de l'envoi des scripts : plusieurs nœuds simulés locaux, avec latence et pannes injectées
+# Usage : python benchmarks/bench_push.py [--sites 500] [--nodes 10] [--delay 0.2] [--drop-rate 0.05]
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Racine du projet
+
+from fake_node import start_fake_node
+from push import push_sites
+from synthetic import synthetic_sites
+
+
+async def run(args):
+    """Démarre les nœuds simulés, répartit les sites entre eux et envoie tous les scripts."""
+    nodes = [await start_fake_node(delay=args.delay, drop_rate=args.drop_rate, reject_rate=args.reject_rate, seed=i)
+             for i in range(args.nodes)]
+    ports = [port for _, _, port in nodes]
+
+    def rows():
+        for line_no, site in synthetic_sites(args.sites):
+            site["node_address"] = f"127.0.0.1:{ports[line_no % len(ports)]}"
+            yield line_no, site
+
+    try:
+        report = await push_sites(rows(), concurrency=args.concurrency, timeout=args.timeout,
+                                  retries=args.retries, backoff=0.05)
+    finally:
+        for server, _, _ in nodes:
+            server.close()
+            await server.wait_closed()
+
+    dropped = sum(node.dropped for _, node, _ in nodes)
+    print(f"{report.sites} sites sur {args.nodes} nœuds (latence {args.delay * 1000:.0f} ms par commit) : "
+          f"{report.elapsed:.2f} s, {report.sites / report.elapsed:,.0f} sites/s")
+    print(f"{report.committed} scripts validés, {report.failed} échecs, {dropped} connexions coupées "
+          f"(retentées), {report.connections} sessions ouvertes")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Débit de push.py contre des nœuds simulés locaux.")
+    parser.add_argument("--sites", type=int, default=500, help="Nombre de sites")
+    parser.add_argument("--nodes", type=int, default=10, help="Nombre de nœuds simulés")
+    parser.add_argument("--delay", type=float, default=0.2, help="Temps de traitement d'un commit (secondes)")
+    parser.add_argument("--drop-rate", type=float, default=0.05, help="Probabilité de coupure au commit")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Probabilité de refus d'un commit")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="Sites traités simultanément")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Délai maximal par échange (secondes)")
+    parser.add_argument("--retries", type=int, default=3, help="Nouvelles tentatives après un échec")
+    args = parser.parse_args(argv)
+    report = asyncio.run(run(args))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
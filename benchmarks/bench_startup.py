@@ -0,0 +1,73 @@
+# Mesure du temps de démarrage : import des modules et délai jusqu'au premier script généré
+# Usage : python benchmarks/bench_startup.py [-r RÉPÉTITIONS] [--max-ms SEUIL]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Racine du projet
+
+# Site d'exemple passé à "python -m siu render"
+SITE = [
+    "nom_station=MDN_ZARZIS_01", "port_number_2g3g=7", "IUB_vlan_number=1201", "OM_vlan_number=1202",
+    "ABIS_vlan_number=1203", "SIU_OM_vlan_number=1204", "ABIS_primary_ip=172.27.162.10",
+    "SIU_OM_primary_ip=172.27.162.70", "TG_transport=TG63", "port_number_4g=6", "port_id=TN_B",
+    "vlan_s1_up=2201", "vlan_s1_cp=2202", "vlan_enodeB_om=2203",
+]
+
+# Mesure de l'import dans un interpréteur neuf ; affiche la durée (ms) et la présence de tkinter
+IMPORT_PROBE = (
+    "import sys, time; t = time.perf_counter(); import {module}; "
+    "print((time.perf_counter() - t) * 1000, 'tkinter' in sys.modules)"
+)
+
+
+def wall_time_ms(args, repeat):
+    """Lance une commande plusieurs fois et retourne la médiane de sa durée totale (ms)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def import_time_ms(module, repeat):
+    """Retourne la médiane du temps d'import d'un module (ms) et indique s'il a chargé tkinter."""
+    samples, loads_tk = [], False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+                             cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+        samples.append(float(out[0]))
+        loads_tk = loads_tk or out[1] == "True"
+    return statistics.median(samples), loads_tk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure le temps de démarrage de la ligne de commande.")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Nombre de lancements par mesure")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Échec si le délai jusqu'au premier script dépasse ce seuil (ms)")
+    args = parser.parse_args(argv)
+
+    interpreter = wall_time_ms([sys.executable, "-c", "pass"], args.repeat)
+    print(f"Interpréteur seul                : {interpreter:8.1f} ms")
+    status = 0
+    for module in ("generation", "siu", "configuration_"):
+        elapsed, loads_tk = import_time_ms(module, args.repeat)
+        print(f"Import {module:25} : {elapsed:8.1f} ms{'   (charge tkinter !)' if loads_tk else ''}")
+        if loads_tk:
+            status = 1
+    first_script = wall_time_ms([sys.executable, "-m", "siu", "render", *SITE], args.repeat)
+    print(f"python -m siu render (total)     : {first_script:8.1f} ms "
+          f"(dont {first_script - interpreter:.1f} ms après le démarrage de l'interpréteur)")
+    if args.max_ms is not None and first_script > args.max_ms:
+        print(f"Seuil dépassé : {first_script:.1f} ms > {args.max_ms:.1f} ms", file=sys.stderr)
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
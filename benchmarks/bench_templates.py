@@ -0,0 +1,52 @@
+# Micro-benchmark : rendu des scripts par concaténation (ancienne méthode) et par modèles précompilés
+# Usage : python benchmarks/bench_templates.py [-n NOMBRE]
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Racine du projet
+
+from legacy import legacy_script_2g3g, legacy_script_4g
+from profiles import load_profile
+
+PROFILE = load_profile()            # Profil par défaut : constantes de l'ancienne génération
+
+# Site d'exemple (valeurs déjà validées)
+SITE_2G3G = {
+    "nom_station": "MDN_ZARZIS_01", "port_number": "7", "iub_vlan": "1201", "om_vlan": "1202",
+    "abis_vlan": "1203", "siu_om_vlan": "1204", "abis_ip": "172.27.162.10",
+    "siu_om_ip": "172.27.162.70", "tg_transport": "TG63",
+}
+SITE_4G = {"port_number": "6", "port_id": "TN_B", "s1_up_vlan": "2201", "s1_cp_vlan": "2202", "enodeb_om_vlan": "2203"}
+
+
+def renders_per_second(func, number):
+    """Mesure le nombre de rendus par seconde (meilleure de cinq séries)."""
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return number / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare la concaténation ligne par ligne et les modèles précompilés.")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Nombre de rendus par série")
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("2G/3G", lambda: legacy_script_2g3g(**SITE_2G3G), lambda: PROFILE.script_2g3g.render(SITE_2G3G)),
+        ("4G", lambda: legacy_script_4g(**SITE_4G), lambda: PROFILE.script_4g.render(SITE_4G)),
+    ]
+    for name, before, after in cases:
+        # Le rendu par modèle doit être identique, octet pour octet, à l'ancienne génération
+        if before() != after():
+            print(f"{name} : le rendu par modèle diffère de l'ancienne génération !", file=sys.stderr)
+            return 1
+        rate_before = renders_per_second(before, args.number)
+        rate_after = renders_per_second(after, args.number)
+        print(f"{name:6} avant : {rate_before:>10,.0f} rendus/s   après : {rate_after:>10,.0f} rendus/s   "
+              f"(x{rate_after / rate_before:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# Ancienne implémentation de generate_script (concaténation ligne par ligne), conservée
+# comme référence pour les benchmarks et pour vérifier que les modèles produisent un résultat identique
+
+
+def legacy_script_2g3g(nom_station, port_number, iub_vlan, om_vlan, abis_vlan, siu_om_vlan, abis_ip, siu_om_ip, tg_transport):
+    """Génère le script 2G/3G par concaténation successive (sans validation)."""
+    script_content = "endtransaction t\n\nstarttransaction t\n\n"  # Début de la transaction
+    script_content += "subscribe 172.31.42.8 1\n\n"  # Abonnement à l'adresse de gestion
+    script_content += f"setmoattribute t stn=0 STN_Name {nom_station}\n"  # Définit le nom de la station
+    script_content += f"setmoattribute t stn=0 promptprefix {nom_station}\n"  # Définit le préfixe du prompt
+    script_content += "setmoattribute t stn=0 depip_interface STN=0,ipinterface=SIU_OM\n"  # Interface IP dépendante
+    script_content += "setmoattribute t stn=0 STN_PGW_KeepalivePeriod 30\n"  # Période de keepalive
+    script_content += "setmoattribute t stn=0 STN_PGW_L2TP_MaxTransmissions 10\n"  # Max transmissions L2TP
+    script_content += "setmoattribute t stn=0 STN_PGW_L2TP_RetransmissionCap 4\n"  # Capacité de retransmission
+    script_content += "setmoattribute t stn=0 systemclocktimeserver 192.168.13.133\n"  # Serveur NTP principal
+    script_content += "setmoattribute t stn=0 wakeupdestination 172.31.42.8\n"  # Destination de réveil
+    script_content += "setmoattribute t stn=0 wakeupeventinterval 2\n\n"  # Intervalle d'événement de réveil
+
+    # Configuration de l'interface Ethernet RBS
+    script_content += f"createmo t stn=0,EthernetInterface=RBS\n"
+    script_content += f"setmoattribute t STN=0,EthernetInterface=RBS portnumber {port_number}\n"
+    script_content += "setmoattribute t STN=0,EthernetInterface=RBS portId TN_A\n\n"
+    # Configuration de l'interface Ethernet Metro
+    script_content += "createmo t stn=0,EthernetInterface=Metro\n"
+    script_content += "setmoattribute t STN=0,EthernetInterface=Metro port SFP\n"
+    script_content += "setmoattribute t STN=0,EthernetInterface=Metro portnumber 1\n"
+    script_content += "setmoattribute t STN=0,EthernetInterface=Metro portId TN_E\n\n"
+
+    # Création des bridges pour Iub et OM
+    script_content += "createmo t STN=0,bridge=Iub\n"
+    script_content += "createmo t STN=0,bridge=OM\n\n"
+    # Configuration du groupe VLAN pour RBS
+    script_content += "createmo t STN=0,VLANGroup=RBS\n"
+    script_content += "setmoattribute t STN=0,VLANGroup=RBS depLinkLayer STN=0,EthernetInterface=RBS\n"
+    script_content += f"createmo t STN=0,VLANGroup=RBS,vlan=Iub\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=RBS,vlan=Iub depbridge STN=0,bridge=Iub\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=RBS,vlan=Iub tagvalue {iub_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=RBS,vlan=OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=RBS,vlan=OM depbridge STN=0,bridge=OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=RBS,vlan=OM tagvalue {om_vlan}\n\n"
+    # Configuration du groupe VLAN pour Metro
+    script_content += "createmo t STN=0,VLANGroup=Metro\n"
+    script_content += "setmoattribute t STN=0,VLANGroup=Metro depLinkLayer STN=0,EthernetInterface=Metro\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=Iub\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=Iub depbridge STN=0,bridge=Iub\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=Iub tagvalue {iub_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=OM depbridge STN=0,bridge=OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=OM tagvalue {om_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=Abis\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=Abis tagvalue {abis_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=SIU_OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=SIU_OM tagvalue {siu_om_vlan}\n\n"
+    # Configuration de l'interface IP Abis
+    script_content += "createmo t stn=0,ipinterface=Abis\n"
+    script_content += f"setmoattribute t stn=0,ipinterface=Abis deplinklayer STN=0,VLANGroup=Metro,vlan=Abis\n"
+    script_content += f"setmoattribute t stn=0,ipinterface=Abis primaryip_address {abis_ip}\n"
+    script_content += "setmoattribute t stn=0,ipinterface=Abis primarysubnetmask 255.255.255.192\n\n"
+    # Configuration de l'interface IP SIU_OM
+    script_content += "createmo t stn=0,ipinterface=SIU_OM\n"
+    script_content += f"setmoattribute t stn=0,ipinterface=SIU_OM deplinklayer STN=0,VLANGroup=Metro,vlan=SIU_OM\n"
+    script_content += f"setmoattribute t stn=0,ipinterface=SIU_OM primaryip_address {siu_om_ip}\n"
+    script_content += "setmoattribute t stn=0,ipinterface=SIU_OM primarysubnetmask 255.255.255.192\n"
+    script_content += "setmoattribute t stn=0,ipinterface=SIU_OM defaultgateway 172.27.162.65\n\n"
+    # Configuration des interfaces E1/T1
+    script_content += "createmo t STN=0,e1t1interface=0\n"
+    script_content += "createmo t STN=0,e1t1interface=1\n\n"
+    # Configuration du TGTransport
+    script_content += f"createmo t STN=0,tgtransport={tg_transport}\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport} pgw_ip_address 172.31.54.131\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport} depip_interface STN=0,ipinterface=Abis\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport} overloadreportinterval 10\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport} DSCP_L2TP_CP 51\n\n"
+    script_content += f"createmo t stn=0,tgtransport={tg_transport},superchannel=0\n"
+    script_content += f"createmo t stn=0,tgtransport={tg_transport},superchannel=1\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport},superchannel=0 depe1t1interface 0\n"
+    script_content += f"setmoattribute t STN=0,tgtransport={tg_transport},superchannel=1 depe1t1interface 1\n\n"
+    # Configuration de la table de routage
+    script_content += "createmo t stn=0,routingtable=0,iproute=Abis\n"
+    script_content += f"setmoattribute t stn=0,routingtable=0,iproute=Abis admdistance 2\n"
+    script_content += f"setmoattribute t stn=0,routingtable=0,iproute=Abis destipsubnet 172.31.54.128/26\n"
+    script_content += f"setmoattribute t stn=0,routingtable=0,iproute=Abis forwardinginterface STN=0,ipinterface=Abis\n"
+    script_content += f"setmoattribute t stn=0,routingtable=0,iproute=Abis nexthopipaddress 172.27.162.1\n\n"
+    # Configuration des serveurs NTP
+    script_content += "createmo t stn=0,synchronization=0,timeserver=NTP0\n"
+    script_content += "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP0 TS_IP_Address 192.168.14.138\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0,TimeServer=NTP0 TS_priority 60\n"
+    script_content += f"setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    script_content += "createmo t stn=0,synchronization=0,timeserver=NTP1\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0,TimeServer=NTP1 TS_IP_Address 192.168.10.25\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0,TimeServer=NTP1 TS_priority 0\n"
+    script_content += f"setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    script_content += "createmo t stn=0,synchronization=0,timeserver=NTP2\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0,TimeServer=NTP2 TS_IP_Address 192.168.13.133\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0,TimeServer=NTP2 TS_priority 50\n"
+    script_content += f"setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    script_content += f"setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    script_content += "commit t forcedcommit\n\n"  # Valide la transaction
+    script_content += "endtransaction t\n"  # Fin de la transaction
+    return script_content
+
+
+def legacy_script_4g(port_number, port_id, s1_up_vlan, s1_cp_vlan, enodeb_om_vlan):
+    """Génère le script 4G par concaténation successive (sans validation)."""
+    script_content = "endtransaction t\n\nstarttransaction t\n\n"  # Début de la transaction
+    # Configuration de l'interface Ethernet Enode_B
+    script_content += f"createmo t stn=0,EthernetInterface=Enode_B\n"
+    script_content += f"setmoattribute t STN=0,EthernetInterface=Enode_B portnumber {port_number}\n"
+    script_content += f"setmoattribute t STN=0,EthernetInterface=Enode_B portId {port_id}\n\n"
+    # Création des bridges pour 4G
+    script_content += "createmo t STN=0,bridge=S1-UP\n"
+    script_content += "createmo t STN=0,bridge=EnodeB_OM\n"
+    script_content += "createmo t STN=0,bridge=S1-CP\n\n"
+    # Configuration du groupe VLAN pour Enode_B
+    script_content += "createmo t STN=0,VLANGroup=Enode_B\n"
+    script_content += "setmoattribute t STN=0,VLANGroup=Enode_B depLinkLayer STN=0,EthernetInterface=Enode_B\n"
+    script_content += f"createmo t STN=0,VLANGroup=Enode_B,vlan=S1-UP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-UP depbridge STN=0,bridge=S1-UP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-UP tagvalue {s1_up_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Enode_B,vlan=S1-CP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-CP depbridge STN=0,bridge=S1-CP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-CP tagvalue {s1_cp_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM depbridge STN=0,bridge=EnodeB_OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM tagvalue {enodeb_om_vlan}\n\n"
+    # Configuration du groupe VLAN pour Metro
+    script_content += "createmo t STN=0,VLANGroup=Metro\n"
+    script_content += "setmoattribute t STN=0,VLANGroup=Metro depLinkLayer STN=0,EthernetInterface=Metro\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=S1-UP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-UP depbridge STN=0,bridge=S1-UP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-UP tagvalue {s1_up_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=S1-CP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-CP depbridge STN=0,bridge=S1-CP\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-CP tagvalue {s1_cp_vlan}\n\n"
+    script_content += f"createmo t STN=0,VLANGroup=Metro,vlan=EnodeB_OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=EnodeB_OM depbridge STN=0,bridge=EnodeB_OM\n"
+    script_content += f"setmoattribute t STN=0,VLANGroup=Metro,vlan=EnodeB_OM tagvalue {enodeb_om_vlan}\n\n"
+    script_content += "checkconsistency t\n\n"  # Vérifie la cohérence
+    script_content += "commit t\n"  # Valide le script
+    return script_content
@@ -0,0 +1,172 @@
+# Suite de benchmarks : validation, rendu, génération de bout en bout et mémoire maximale,
+# comparés à des valeurs de référence pour détecter les régressions avant un déploiement.
+# Usage : python benchmarks/suite.py [--sizes 1,100,10000,100000] [--check] [--update-baseline]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Racine du projet
+sys.path.insert(0, ROOT)
+
+from generation import build_script_2g3g, build_script_4g, is_valid_ip, is_valid_vlan
+from profiles import load_profile
+from synthetic import synthetic_sites, write_inventory
+
+try:
+    import resource                 # Mesure de la mémoire maximale (Unix uniquement)
+except ImportError:
+    resource = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_SIZES = "1,100,10000,100000"
+DEFAULT_THRESHOLD = 0.25            # Écart toléré par rapport à la référence (25 %)
+
+
+def _rate(func, number):
+    """Nombre d'appels par seconde (meilleure de trois séries)."""
+    return number / min(timeit.repeat(func, number=number, repeat=3))
+
+
+def bench_validators():
+    """Débit de is_valid_ip et is_valid_vlan sur un mélange de valeurs valides et invalides."""
+    ips = ["172.27.162.10", "10.0.0.1", "256.1.1.1", "1.2.3", "abc.def.1.2", "192.168.13.133", "", "8.8.8.8"]
+    vlans = ["1", "100", "4094", "0", "4095", "abc", "1201", "-5"]
+    return {
+        "is_valid_ip": (_rate(lambda: [is_valid_ip(ip) for ip in ips], 20000) * len(ips), "appels/s", True),
+        "is_valid_vlan": (_rate(lambda: [is_valid_vlan(v) for v in vlans], 20000) * len(vlans), "appels/s", True),
+    }
+
+
+def bench_render():
+    """Débit de génération (validation et rendu) d'un script 2G/3G et d'un script 4G, profil déjà chargé (comme bulk.py)."""
+    _, site = next(synthetic_sites(1))
+    profile = load_profile()
+    return {
+        "render_2g3g": (_rate(lambda: build_script_2g3g(site, profile), 20000), "scripts/s", True),
+        "render_4g": (_rate(lambda: build_script_4g(site, profile), 20000), "scripts/s", True),
+    }
+
+
+def _peak_rss_mb():
+    """
+    Mémoire résidente maximale du processus, plus celle du plus gros de ses processus de travail (Mo), ou None.
+    Ce n'est pas la mémoire totale de la génération parallèle : RUSAGE_CHILDREN donne le maximum du seul
+    enfant le plus gourmand, pas la somme des maxima de tous les enfants.
+    """
+    if resource is None:
+        return None
+    # Maximum du processus principal + maximum du plus gros processus de travail (terminé)
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024  # Octets sous macOS, Ko ailleurs
+
+
+def end_to_end_child(count, workers):
+    """
+    Mesure exécutée dans un processus neuf : génération complète (lecture, validation, rendu, écriture)
+    d'un inventaire synthétique. Affiche le résultat au format JSON.
+    """
+    from bulk import generate_bulk
+
+    repeat = max(1, min(5, 10000 // count))  # Les petits inventaires sont mesurés plusieurs fois (bruit)
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        inventory = os.path.join(tmp, "inventaire.csv")
+        write_inventory(inventory, count)
+        for run in range(repeat):
+            start = time.perf_counter()
+            report = generate_bulk(inventory, os.path.join(tmp, f"scripts_{run}"), workers=workers)
+            elapsed = time.perf_counter() - start
+            if report.errors:
+                raise SystemExit(f"{len(report.errors)} erreurs de génération")
+            best = elapsed if best is None else min(best, elapsed)
+    elapsed = best
+    print(json.dumps({"sites_per_s": count / elapsed, "peak_rss_mb": _peak_rss_mb()}))
+
+
+def bench_end_to_end(sizes, workers):
+    """
+    Débit de bout en bout et mémoire maximale (processus principal + plus gros processus de travail)
+    pour chaque taille d'inventaire (un processus par taille).
+    """
+    results = {}
+    for count in sizes:
+        args = [sys.executable, os.path.abspath(__file__), "--e2e-child", str(count)]
+        if workers:
+            args += ["--workers", str(workers)]
+        out = json.loads(subprocess.run(args, check=True, capture_output=True, text=True).stdout)
+        results[f"e2e_{count}_sites"] = (out["sites_per_s"], "sites/s", True)
+        if out["peak_rss_mb"] is not None:
+            results[f"peak_rss_{count}_sites"] = (out["peak_rss_mb"], "Mo", False)
+    return results
+
+
+def compare(results, baselines, threshold):
+    """
+    Compare les mesures aux références.
+    Returns:
+        list: Messages décrivant chaque régression au-delà du seuil.
+    """
+    regressions = []
+    for name, (value, unit, higher_is_better) in results.items():
+        reference = baselines.get(name)
+        if reference is None:
+            continue
+        base = reference["value"]
+        worse = value < base * (1 - threshold) if higher_is_better else value > base * (1 + threshold)
+        if worse:
+            regressions.append(f"{name} : {value:,.1f} {unit} (référence {base:,.1f} {unit}, seuil {threshold:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du générateur de scripts SIU.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Tailles d'inventaire (défaut : {DEFAULT_SIZES})")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Nombre de processus de génération")
+    parser.add_argument("--check", action="store_true", help="Échoue si une mesure régresse au-delà du seuil")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Écart toléré (0.25 = 25 %%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Enregistre les mesures comme références")
+    parser.add_argument("--e2e-child", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.e2e_child is not None:
+        end_to_end_child(args.e2e_child, args.workers)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = {}
+    results.update(bench_validators())
+    results.update(bench_render())
+    results.update(bench_end_to_end(sizes, args.workers))
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baselines = json.load(f)
+    for name, (value, unit, _) in results.items():
+        reference = baselines.get(name)
+        ratio = f"  ({value / reference['value']:.2f} x référence)" if reference else ""
+        print(f"{name:24} {value:>14,.1f} {unit}{ratio}")
+
+    if args.update_baseline:
+        baselines.update({name: {"value": round(value, 1), "unit": unit, "higher_is_better": higher}
+                          for name, (value, unit, higher) in results.items()})
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Références enregistrées dans {BASELINE_PATH}")
+
+    if args.check:
+        regressions = compare(results, baselines, args.threshold)
+        for message in regressions:
+            print(f"Régression : {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# Générateur d'inventaires synthétiques réalistes pour les benchmarks
+# Usage : python benchmarks/synthetic.py 10000 -o inventaire.csv [--seed 42]
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Racine du projet
+
+from generation import fields_2g3g, fields_4g
+
+# Codes de gouvernorat et localités utilisés pour composer des noms de station plausibles
+REGIONS = {
+    "MDN": ["ZARZIS", "DJERBA_HOUMT_SOUK", "BEN_GUERDANE", "MIDOUN", "AJIM", "SIDI_MAKHLOUF"],
+    "TAT": ["GHOMRASSEN", "REMADA", "DHEHIBA", "SMAR", "BIR_LAHMAR"],
+    "GBS": ["MARETH", "EL_HAMMA", "MATMATA", "METOUIA", "CHENINI"],
+    "SFX": ["SAKIET_EZZIT", "THYNA", "AGAREB", "JEBENIANA", "KERKENNAH"],
+    "TUN": ["BARDO", "LA_MARSA", "CARTHAGE", "EL_MENZAH", "LE_KRAM"],
+}
+TG_TRANSPORTS = ["TG61", "TG62", "TG63", "TG64"]
+
+
+def _format_ip(value):
+    """Convertit un entier 32 bits en adresse IPv4."""
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def synthetic_sites(count, seed=42):
+    """
+    Produit des sites synthétiques cohérents : noms uniques, VLANs distincts sur le groupe Metro
+    de chaque site, adresses Abis et SIU_OM uniques, chacune dans son sous-réseau /26.
+    Args:
+        count (int): Nombre de sites.
+        seed (int): Graine du générateur aléatoire (résultat reproductible).
+    Yields:
+        tuple: (numéro de ligne, site), au même format que bulk.load_inventory.
+    """
+    rng = random.Random(seed)
+    regions = list(REGIONS.items())
+    for index in range(count):
+        code, towns = regions[index % len(regions)]
+        town = towns[(index // len(regions)) % len(towns)]
+        # Sept VLANs consécutifs par site, répartis sur toute la plage 1-4094
+        base_vlan = 100 + (index * 7) % 3900
+        # Abis : un sous-réseau /26 par site dans 10.0.0.0/8 ; SIU_OM : 32 sites par /26 dans 172.16.0.0/12
+        abis_ip = _format_ip((10 << 24) + ((index << 6) & 0xFFFFFF) + 2 + rng.randrange(60))
+        siu_ip = _format_ip((172 << 24) + (16 << 16) + (((index // 32) << 6) & 0xFFFFF) + 2 + index % 32)
+        site = {
+            "nom_station": f"{code}_{town}_{index:06d}",
+            "port_number_2g3g": "7",
+            "IUB_vlan_number": str(base_vlan),
+            "OM_vlan_number": str(base_vlan + 1),
+            "ABIS_vlan_number": str(base_vlan + 2),
+            "SIU_OM_vlan_number": str(base_vlan + 3),
+            "ABIS_primary_ip": abis_ip,
+            "SIU_OM_primary_ip": siu_ip,
+            "TG_transport": rng.choice(TG_TRANSPORTS),
+            "port_number_4g": "6",
+            "port_id": "TN_B",
+            "vlan_s1_up": str(base_vlan + 4),
+            "vlan_s1_cp": str(base_vlan + 5),
+            "vlan_enodeB_om": str(base_vlan + 6),
+        }
+        yield index + 2, site       # Ligne 1 : en-tête du CSV
+
+
+def write_inventory(path, count, seed=42):
+    """
+    Écrit un inventaire synthétique au format CSV ou JSONL (d'après l'extension).
+    Args:
+        path (str): Chemin du fichier (.csv ou .jsonl).
+        count (int): Nombre de sites.
+        seed (int): Graine du générateur aléatoire.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".jsonl"):
+            for _, site in synthetic_sites(count, seed):
+                f.write(json.dumps(site) + "\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=fields_2g3g + fields_4g)
+            writer.writeheader()
+            writer.writerows(site for _, site in synthetic_sites(count, seed))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un inventaire synthétique de sites SIU.")
+    parser.add_argument("count", type=int, help="Nombre de sites")
+    parser.add_argument("-o", "--output", default="inventaire_synthetique.csv", help="Fichier .csv ou .jsonl")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur aléatoire")
+    args = parser.parse_args(argv)
+    write_inventory(args.output, args.count, args.seed)
+    print(f"{args.count} sites écrits dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# Génération en masse des scripts SIU à partir d'un inventaire de sites (CSV ou JSONL)
+import argparse                     # Pour l'interface en ligne de commande
+import csv                          # Pour lire les inventaires CSV
+import json                         # Pour lire les inventaires JSONL
+import os                           # Pour gérer les fichiers et chemins
+import sys                          # Pour les sorties d'erreur et le code de retour
+from collections import deque       # File des lots en cours de traitement
+from concurrent.futures import ProcessPoolExecutor  # Pour répartir les sites sur plusieurs processus
+from dataclasses import dataclass, field
+from itertools import islice
+
+from cache import RegenerationCache, site_key
+from generation import plan_scripts, render_plan, site_profile, TECHNOLOGIES
+from metrics import DISABLED, Metrics, profile_call
+from mo_model import minimize_scripts
+from sinks import is_archive, open_sink
+
+CHUNK_SIZE = 256                    # Nombre de sites envoyés à un processus en une seule fois
+
+
+@dataclass
+class SiteError:
+    """Erreur rencontrée lors de la génération des scripts d'un site."""
+    line: int                       # Numéro de ligne dans l'inventaire
+    nom_station: str
+    message: str
+
+
+@dataclass
+class BulkReport:
+    """Bilan d'une génération en masse."""
+    sites: int = 0                  # Nombre de sites lus dans l'inventaire
+    generated: int = 0              # Nombre de sites dont les scripts ont été générés
+    cached: int = 0                 # Nombre de sites inchangés depuis la dernière génération (non régénérés)
+    files: int = 0                  # Nombre de fichiers écrits
+    errors: list = field(default_factory=list)  # Liste de SiteError
+    cache_stats: dict = None        # Compteurs du cache de régénération, s'il est utilisé
+
+
+def _normalize(site):
+    """
+    Convertit les valeurs d'une ligne d'inventaire en chaînes (comme les champs de saisie de la GUI).
+    Args:
+        site (dict): Ligne brute de l'inventaire.
+    Returns:
+        dict: Ligne avec des valeurs de type str, sans espaces superflus.
+    """
+    return {str(key).strip(): "" if value is None else str(value).strip() for key, value in site.items() if key is not None}
+
+
+def _is_store(path):
+    """Indique si un chemin désigne un inventaire en colonnes (.siuinv, voir inventory_store.py)."""
+    return path.lower().endswith(".siuinv")
+
+
+def load_inventory(path, errors=None):
+    """
+    Lit un inventaire de sites, une ligne par station, au format CSV (séparateur ',', ';' ou tabulation), JSONL
+    ou en colonnes (.siuinv, voir inventory_store.py).
+    Les colonnes portent les mêmes noms que fields_2g3g et fields_4g ; les colonnes optionnelles "techno"
+    et "profile" permettent de choisir la technologie et le profil de région (voir profiles.py) site par site.
+    Args:
+        path (str): Chemin du fichier d'inventaire (.csv, .jsonl ou .siuinv).
+        errors (list): Si fourni, reçoit un SiteError par ligne JSONL illisible (JSON invalide ou qui n'est pas
+            un objet) et la lecture continue ; sinon, une telle ligne interrompt la lecture (ValueError).
+    Yields:
+        tuple: (numéro de ligne, site) pour chaque station de l'inventaire.
+    Raises:
+        ValueError: Si le format du fichier n'est pas reconnu, ou si une ligne JSONL est illisible sans errors.
+    """
+    if _is_store(path):
+        from inventory_store import InventoryStore
+        with InventoryStore(path) as store:
+            yield from store
+        return
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".csv", ".jsonl"):
+        raise ValueError(f"Format d'inventaire non reconnu : {path} (attendu .csv, .jsonl ou .siuinv)")
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if ext == ".jsonl":
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    site = json.loads(line)
+                except json.JSONDecodeError as e:
+                    message = f"JSON invalide ({e.msg})"
+                else:
+                    if isinstance(site, dict):
+                        yield line_no, _normalize(site)
+                        continue
+                    message = "objet JSON attendu"
+                if errors is None:
+                    raise ValueError(f"Ligne {line_no} : {message}")
+                errors.append(SiteError(line_no, "", message))
+        else:
+            # Détecte le séparateur à partir du début du fichier (les exports Excel utilisent souvent ';')
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.DictReader(f, dialect=dialect)
+            for site in reader:
+                yield reader.line_num, _normalize(site)
+
+
+def _profile_of(site, profiles):
+    """Profil d'un site, chargé une seule fois par nom de profil (profiles : nom -> Profile)."""
+    name = site.get("profile", "")
+    profile = profiles.get(name)
+    if profile is None:
+        profile = profiles[name] = site_profile(site)
+    return profile
+
+
+def _generate_chunk(chunk, techno, minimal=False, combine=False, instrument=False):
+    """
+    Génère les scripts d'un lot de sites (exécuté dans un processus de travail).
+    Args:
+        chunk (list): Liste de tuples (numéro de ligne, site), ou StoreSlice d'un inventaire en colonnes
+            (les sites sont alors lus dans ce processus, lecture mesurée comme l'étape "read").
+        techno (str): Technologie par défaut si le site ne précise pas la sienne.
+        minimal (bool): Réécrit les scripts sous forme minimale (voir mo_model.py).
+        combine (bool): Regroupe les scripts 2G/3G et 4G d'un site en une seule transaction minimale.
+        instrument (bool): Mesure la durée des étapes de validation et de rendu.
+    Returns:
+        tuple: (liste de tuples (numéro de ligne, nom de station, scripts ou None, message d'erreur ou None),
+            mesures du lot pour Metrics.merge ou None).
+    """
+    metrics = Metrics() if instrument else DISABLED
+    results = []
+    profiles = {}
+    sites = chunk if isinstance(chunk, list) else metrics.timed("read", chunk)
+    for line_no, site in sites:
+        nom_station = site.get("nom_station", "")
+        try:
+            with metrics.stage("validate"):
+                plans = plan_scripts(site, site.get("techno") or techno, _profile_of(site, profiles))
+            with metrics.stage("render"):
+                scripts = [render_plan(plan) for plan in plans]
+                if minimal or combine:
+                    scripts = minimize_scripts(scripts, combine)
+        except ValueError as e:
+            results.append((line_no, nom_station, None, str(e)))
+        else:
+            results.append((line_no, nom_station, scripts, None))
+    return results, metrics.snapshot() if instrument else None
+
+
+def _chunks(rows, size):
+    """Découpe un itérable en listes de taille fixe."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_generated(rows, techno, workers=None, chunk_size=CHUNK_SIZE, minimal=False, combine=False, metrics=None):
+    """
+    Génère les scripts de chaque site, dans l'ordre de l'inventaire, en répartissant le travail
+    sur un ProcessPoolExecutor. Le nombre de lots en cours est borné pour garder une mémoire constante.
+    Args:
+        rows (iterable): Tuples (numéro de ligne, site), par exemple issus de load_inventory, ou InventoryStore
+            (avec plusieurs processus, chacun lit alors ses sites directement dans le fichier projeté en mémoire).
+        techno (str): Technologie par défaut ("2G/3G", "4G" ou "Les trois").
+        workers (int): Nombre de processus (par défaut le nombre de cœurs ; 1 pour tout traiter sur place).
+        chunk_size (int): Nombre de sites par lot envoyé à un processus.
+        minimal (bool): Réécrit les scripts sous forme minimale.
+        combine (bool): Regroupe les scripts d'un site en une seule transaction minimale.
+        metrics (Metrics): Reçoit les durées de validation et de rendu mesurées par les processus de travail.
+    Yields:
+        tuple: (numéro de ligne, nom de station, scripts ou None, message d'erreur ou None).
+    """
+    workers = workers or os.cpu_count() or 1
+    metrics = metrics or DISABLED
+    chunks = rows.slices(chunk_size) if workers > 1 and hasattr(rows, "slices") else _chunks(rows, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            results, snapshot = _generate_chunk(chunk, techno, minimal, combine, metrics.enabled)
+            metrics.merge(snapshot)
+            yield from results
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_generate_chunk, chunk, techno, minimal, combine, metrics.enabled))
+            if len(pending) >= workers * 2:
+                results, snapshot = pending.popleft().result()
+                metrics.merge(snapshot)
+                yield from results
+        while pending:
+            results, snapshot = pending.popleft().result()
+            metrics.merge(snapshot)
+            yield from results
+
+
+def _changed_sites(rows, techno, cache, keys, report):
+    """
+    Filtre l'inventaire : ne laisse passer que les sites dont l'empreinte diffère du cache.
+    Les empreintes des sites à régénérer sont conservées dans keys (numéro de ligne -> empreinte).
+    """
+    profiles = {}
+    for line_no, site in rows:
+        nom_station = site.get("nom_station", "")
+        try:
+            digest = _profile_of(site, profiles).digest
+        except ValueError:
+            digest = ""             # Profil inconnu ou invalide : l'erreur sera relevée à la génération
+        key = site_key(site, site.get("techno") or techno, digest)
+        if nom_station and cache.lookup(nom_station, key):
+            report.sites += 1
+            report.cached += 1
+            continue
+        keys[line_no] = key
+        yield line_no, site
+
+
+def generate_bulk(inventory_path, output, techno="Les trois", workers=None, shard=False, atomic=False,
+                  cache_path=None, cache_size=None, minimal=False, combine=False, metrics=None):
+    """
+    Génère et sauvegarde les scripts de tous les sites d'un inventaire.
+    Chaque script est écrit dans la destination dès sa génération, puis libéré.
+    Les erreurs sont relevées site par site sans interrompre le traitement.
+    Args:
+        inventory_path (str): Chemin de l'inventaire (.csv, .jsonl ou .siuinv).
+        output (str): Dossier de destination, ou archive .zip / .tar / .tar.gz.
+        techno (str): Technologie par défaut ("2G/3G", "4G" ou "Les trois").
+        workers (int): Nombre de processus de génération.
+        shard (bool): Répartit les fichiers dans des sous-dossiers selon le hachage de leur nom.
+        atomic (bool): Écriture atomique (fichier temporaire, fsync, renommage).
+        cache_path (str): Manifeste de régénération incrémentale (dossier de destination uniquement) :
+            seuls les sites modifiés depuis la génération précédente sont régénérés.
+        cache_size (int): Nombre maximal de stations conservées dans le manifeste.
+        minimal (bool): Réécrit les scripts sous forme minimale (MO et attributs en double fusionnés).
+        combine (bool): Regroupe les scripts 2G/3G et 4G d'un site en une seule transaction minimale.
+        metrics (Metrics): Instrumentation des étapes (lecture, validation, rendu, écriture) et compteurs.
+    Returns:
+        BulkReport: Bilan de la génération.
+    Raises:
+        ValueError: Si le cache est demandé avec une archive (elle est toujours réécrite entièrement).
+    """
+    report = BulkReport()
+    metrics = metrics or DISABLED
+    read_errors = []                # Lignes illisibles de l'inventaire, relevées comme les erreurs de génération
+    store = None
+    if _is_store(inventory_path) and not cache_path:
+        from inventory_store import InventoryStore
+        rows = store = InventoryStore(inventory_path)  # Transmis aux processus par tranches, sans copie des sites
+        if (workers or os.cpu_count() or 1) == 1:
+            rows = metrics.timed("read", store)  # Sur place : lecture directe, sans seconde projection du fichier
+    else:
+        rows = metrics.timed("read", load_inventory(inventory_path, read_errors))
+    cache = None
+    keys = {}
+    if cache_path:
+        if is_archive(output):
+            raise ValueError("Le cache de régénération nécessite un dossier de destination, pas une archive")
+        # Toute option qui change le contenu ou l'emplacement des fichiers invalide le manifeste
+        destination = f"{os.path.abspath(output)}|shard={shard}|minimal={minimal}|combine={combine}"
+        cache = RegenerationCache(cache_path, destination, cache_size)
+        rows = _changed_sites(rows, techno, cache, keys, report)
+
+    try:
+        with open_sink(output, shard, atomic) as sink:
+            if cache:
+                # Les fichiers des sites inchangés restent en place : leurs noms sont réservés avant toute écriture
+                for nom, name in cache.assigned_names():
+                    sink.reserve(name, nom)
+            for line_no, nom_station, scripts, error in iter_generated(rows, techno, workers, minimal=minimal,
+                                                                       combine=combine, metrics=metrics):
+                report.sites += 1
+                key = keys.pop(line_no, None)
+                if error:
+                    report.errors.append(SiteError(line_no, nom_station, error))
+                    if cache:
+                        cache.discard(nom_station)
+                    continue
+                names = []
+                previous = cache.names(nom_station) if cache and nom_station else ()
+                with metrics.stage("write"):
+                    for script_type, script_content, _ in scripts:
+                        names.append(sink.write_script(nom_station, script_type, script_content, line_no, previous))
+                        report.files += 1
+                if metrics.enabled:
+                    metrics.add("bytes_written", sum(len(content.encode("utf-8")) for _, content, _ in scripts))
+                if cache and nom_station:
+                    cache.record(nom_station, key, [sink.path_for(name) for name in names])
+                report.generated += 1
+    finally:
+        if store is not None:
+            store.close()
+
+    if read_errors:
+        report.sites += len(read_errors)
+        report.errors = sorted(report.errors + read_errors, key=lambda e: e.line)
+    if cache:
+        cache.save()
+        report.cache_stats = cache.stats()
+    metrics.add("sites", report.sites)
+    metrics.add("sites_generated", report.generated)
+    metrics.add("sites_cached", report.cached)
+    metrics.add("validation_failures", len(report.errors))
+    metrics.add("files_written", report.files)
+    return report
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : python bulk.py inventaire.csv -o scripts/"""
+    parser = argparse.ArgumentParser(description="Génère les scripts SIU de tous les sites d'un inventaire.")
+    parser.add_argument("inventory", help="Inventaire des sites (.csv, .jsonl ou .siuinv)")
+    parser.add_argument("-o", "--output", default="scripts",
+                        help="Dossier de destination ou archive .zip/.tar/.tar.gz (défaut : scripts)")
+    parser.add_argument("-t", "--techno", default="Les trois", choices=TECHNOLOGIES, help="Technologie par défaut")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--shard", action="store_true", help="Répartit les fichiers dans des sous-dossiers par hachage")
+    parser.add_argument("--atomic", action="store_true", help="Écriture atomique (fichier temporaire, fsync, renommage)")
+    parser.add_argument("--cache", metavar="MANIFESTE", default=None,
+                        help="Ne régénère que les sites modifiés depuis la dernière exécution (manifeste JSON)")
+    parser.add_argument("--cache-size", type=int, default=None, help="Nombre maximal de stations dans le manifeste")
+    parser.add_argument("--minimal", action="store_true", help="Scripts minimaux (MO et attributs en double fusionnés)")
+    parser.add_argument("--combine", action="store_true",
+                        help="Une seule transaction minimale par site pour 2G/3G et 4G")
+    parser.add_argument("--metrics", metavar="FICHIER", default=None,
+                        help="Durée des étapes et compteurs : format Prometheus (.prom) ou JSON (.json)")
+    parser.add_argument("--profile", choices=["cpu", "memory"], default=None,
+                        help="Profile l'exécution (cProfile ou tracemalloc) ; un seul processus par défaut")
+    parser.add_argument("--profile-output", default=None,
+                        help="Résultat du profilage (défaut : profil.prof ou profil_memoire.txt)")
+    args = parser.parse_args(argv)
+
+    metrics = Metrics() if args.metrics else None
+    options = (args.inventory, args.output, args.techno, args.workers, args.shard, args.atomic,
+               args.cache, args.cache_size, args.minimal, args.combine, metrics)
+    try:
+        if args.profile:
+            # Les processus de travail échappent au profilage : tout est traité sur place sauf si -j est donné
+            options = options[:3] + (args.workers or 1,) + options[4:]
+            output = args.profile_output or ("profil.prof" if args.profile == "cpu" else "profil_memoire.txt")
+            report = profile_call(args.profile, output, generate_bulk, *options)
+        else:
+            report = generate_bulk(*options)
+        if metrics:
+            metrics.write(args.metrics)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    for error in report.errors:
+        print(f"Ligne {error.line} ({error.nom_station or '?'}) : {error.message}", file=sys.stderr)
+    print(f"{report.generated}/{report.sites} sites générés, {report.files} fichiers écrits dans {args.output}")
+    if report.cache_stats:
+        stats = report.cache_stats
+        print(f"Cache : {report.cached} sites inchangés, {stats['hits']} succès / {stats['misses']} échecs "
+              f"(taux {stats['hit_rate']:.1%}), {stats['evictions']} évictions")
+    if metrics:
+        print(metrics.summary())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
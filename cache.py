@@ -0,0 +1,121 @@
+# Cache de régénération incrémentale : seuls les sites dont les données ont changé sont régénérés
+# Le manifeste associe chaque station à l'empreinte de ses données et aux fichiers produits.
+import hashlib                      # Pour calculer l'empreinte des données d'un site
+import json                         # Format du manifeste
+import os                           # Pour gérer les fichiers et chemins
+from collections import OrderedDict  # Ordre d'utilisation des entrées (éviction des plus anciennes)
+
+from generation import fields_2g3g, fields_4g
+from templates import TEMPLATE_VERSION
+
+MANIFEST_VERSION = 1                # Version du format du fichier manifeste
+
+
+def site_key(site, techno, profile_digest=""):
+    """
+    Calcule l'empreinte des données d'un site : valeurs des champs utilisés par la technologie,
+    technologie, version des modèles et contenu du profil. Deux sites de même empreinte produisent les mêmes scripts.
+    Args:
+        site (dict): Valeurs des champs du site.
+        techno (str): Technologie sélectionnée pour le site.
+        profile_digest (str): Empreinte du profil du site (Profile.digest).
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    names = []
+    if techno in ("2G/3G", "Les trois"):
+        names += fields_2g3g
+    if techno in ("4G", "Les trois"):
+        names += fields_4g
+    if "nom_station" not in names:
+        names.append("nom_station")  # Le nom de station détermine aussi le nom des fichiers
+    payload = "\x1f".join([str(TEMPLATE_VERSION), techno, profile_digest] + [f"{name}={site.get(name, '').strip()}" for name in names])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RegenerationCache:
+    """
+    Manifeste persistant station -> (empreinte, fichiers produits), borné en nombre d'entrées.
+    Args:
+        path (str): Chemin du fichier manifeste (JSON), créé au premier enregistrement.
+        destination (str): Identifiant de la destination des scripts ; s'il diffère de celui du manifeste,
+            toutes les stations sont régénérées.
+        max_entries (int): Nombre maximal de stations conservées (les moins récemment utilisées sont évincées).
+    """
+
+    def __init__(self, path, destination, max_entries=None):
+        self.path = path
+        self.destination = destination
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION and manifest.get("destination") == self.destination:
+                self.entries.update((nom, (entry["hash"], entry["outputs"])) for nom, entry in manifest["sites"].items())
+                self._evict()
+
+    def lookup(self, nom_station, key):
+        """
+        Indique si les scripts d'une station sont à jour et compte le succès ou l'échec.
+        Returns:
+            bool: True si l'empreinte enregistrée est identique et que tous les fichiers produits
+                existent encore (un fichier supprimé depuis la dernière génération est recréé).
+        """
+        entry = self.entries.get(nom_station)
+        if entry is not None and entry[0] == key and all(os.path.isfile(path) for path in entry[1]):
+            self.entries.move_to_end(nom_station)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def names(self, nom_station):
+        """Noms des fichiers attribués à une station lors de la génération précédente."""
+        entry = self.entries.get(nom_station)
+        return [os.path.basename(path) for path in entry[1]] if entry else []
+
+    def assigned_names(self):
+        """Couples (station, nom de fichier) de toutes les stations du manifeste."""
+        return [(nom, os.path.basename(path)) for nom, (_, outputs) in self.entries.items() for path in outputs]
+
+    def record(self, nom_station, key, outputs):
+        """Enregistre l'empreinte et les fichiers produits pour une station régénérée."""
+        self.entries[nom_station] = (key, outputs)
+        self.entries.move_to_end(nom_station)
+        self._evict()
+
+    def _evict(self):
+        """Évince les stations les moins récemment utilisées au-delà de la taille maximale."""
+        if self.max_entries is not None:
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, nom_station):
+        """Oublie une station (par exemple après une erreur de génération)."""
+        self.entries.pop(nom_station, None)
+
+    @property
+    def hit_rate(self):
+        """Proportion de stations trouvées à jour dans le cache (0 à 1)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Retourne les compteurs du cache sous forme de dictionnaire."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "hit_rate": round(self.hit_rate, 4)}
+
+    def save(self):
+        """Écrit le manifeste de façon atomique (fichier temporaire puis renommage)."""
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "destination": self.destination,
+            "sites": {nom: {"hash": key, "outputs": outputs} for nom, (key, outputs) in self.entries.items()},
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,119 @@
+# Nœud SIU simulé : serveur TCP local qui reçoit des scripts de configuration ligne par ligne
+# Il permet de tester l'envoi des scripts (push.py), son débit et la gestion des pannes sans réseau réel.
+# Usage : python fake_node.py --port 7300 [--delay 0.05] [--drop-rate 0.1] [--reject-rate 0.05]
+#
+# Protocole : le client envoie les lignes du script ; à chaque "commit", le nœud répond par une ligne
+# "OK <nombre de commandes>" si la transaction est valide, ou "ERROR <message>" sinon.
+import argparse                     # Pour l'interface en ligne de commande
+import asyncio                      # Serveur TCP asynchrone
+import random                       # Pour simuler les pannes
+import sys
+
+from mo_model import MOTree
+from push import DEFAULT_PORT       # Même port par défaut que le client
+
+
+class FakeNode:
+    """
+    Comportement d'un nœud simulé, partagé par toutes ses connexions.
+    Args:
+        delay (float): Temps de traitement simulé d'un commit (secondes).
+        drop_rate (float): Probabilité de couper la connexion au lieu de répondre à un commit.
+        reject_rate (float): Probabilité de refuser un commit valide.
+        seed (int): Graine du générateur aléatoire (pannes reproductibles).
+    """
+
+    def __init__(self, delay=0.0, drop_rate=0.0, reject_rate=0.0, seed=None):
+        self.delay = delay
+        self.drop_rate = drop_rate
+        self.reject_rate = reject_rate
+        self.random = random.Random(seed)
+        self.connections = 0        # Nombre de connexions acceptées
+        self.commits = 0            # Nombre de transactions validées
+        self.rejected = 0
+        self.dropped = 0
+
+    async def handle(self, reader, writer):
+        """Traite une connexion : plusieurs transactions peuvent se suivre sur la même session."""
+        self.connections += 1
+        tree, count, error = MOTree(), 0, None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode("utf-8", "replace").strip()
+                if not text:
+                    continue
+                try:
+                    tree.apply(text)
+                except ValueError as e:
+                    error = error or str(e)  # La première erreur de la transaction est rapportée
+                count += 1
+                if text.split(None, 1)[0].lower() != "commit":
+                    continue
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                if self.random.random() < self.drop_rate:
+                    self.dropped += 1
+                    break               # Panne simulée : connexion coupée sans réponse
+                if error is None and self.random.random() < self.reject_rate:
+                    error = "Commit refusé par le nœud"
+                if error is None:
+                    self.commits += 1
+                    writer.write(f"OK {count}\n".encode())
+                else:
+                    self.rejected += 1
+                    writer.write(f"ERROR {error}\n".encode())
+                await writer.drain()
+                tree, count, error = MOTree(), 0, None
+        except (ConnectionError, asyncio.CancelledError):
+            pass                        # Client déconnecté ou arrêt du serveur
+        finally:
+            writer.close()
+
+
+async def start_fake_node(host="127.0.0.1", port=0, **options):
+    """
+    Démarre un nœud simulé.
+    Args:
+        host (str): Adresse d'écoute.
+        port (int): Port d'écoute (0 : port libre choisi par le système).
+        **options: Paramètres de FakeNode (delay, drop_rate, reject_rate, seed).
+    Returns:
+        tuple: (serveur asyncio, FakeNode, port effectif).
+    """
+    node = FakeNode(**options)
+    server = await asyncio.start_server(node.handle, host, port)
+    return server, node, server.sockets[0].getsockname()[1]
+
+
+async def _serve(args):
+    server, node, port = await start_fake_node(args.host, args.port, delay=args.delay, drop_rate=args.drop_rate,
+                                               reject_rate=args.reject_rate, seed=args.seed)
+    print(f"Nœud simulé à l'écoute sur {args.host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print(f"{node.connections} connexions, {node.commits} commits, {node.rejected} refusés, {node.dropped} coupés")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nœud SIU simulé pour tester l'envoi des scripts.")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port d'écoute (défaut : {DEFAULT_PORT})")
+    parser.add_argument("--delay", type=float, default=0.0, help="Temps de traitement d'un commit (secondes)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Probabilité de couper la connexion au commit")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="Probabilité de refuser un commit")
+    parser.add_argument("--seed", type=int, default=None, help="Graine des pannes simulées")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
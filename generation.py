@@ -0,0 +1,225 @@
+# Logique de génération des scripts SIU, indépendante de l'interface graphique
+# (utilisable par la GUI, les traitements en masse et les scripts d'automatisation)
+# Les valeurs communes à une région proviennent du profil du site (voir profiles.py).
+
+# Technologies disponibles (mêmes libellés que la liste déroulante de la GUI)
+TECHNOLOGIES = ["2G/3G", "4G", "Les trois"]
+
+# Champs pour 2G/3G
+fields_2g3g = [
+    "nom_station", "port_number_2g3g", "IUB_vlan_number", "OM_vlan_number",
+    "ABIS_vlan_number", "SIU_OM_vlan_number", "ABIS_primary_ip",
+    "SIU_OM_primary_ip", "TG_transport"
+]
+# Champs pour 4G
+fields_4g = ["port_number_4g", "port_id", "vlan_s1_up", "vlan_s1_cp", "vlan_enodeB_om"]
+
+
+# Fonction pour valider une adresse IP
+def is_valid_ip(ip):
+    """
+    Vérifie si une adresse IP est valide (format xxx.xxx.xxx.xxx, chaque partie entre 0 et 255).
+    Args:
+        ip (str): Adresse IP à valider.
+    Returns:
+        bool: True si valide ou vide, False sinon.
+    """
+    if not ip:                      # Si le champ est vide, considéré comme valide (pour les champs optionnels)
+        return True
+    parts = ip.split('.')           # Sépare l'adresse IP en quatre parties
+    if len(parts) != 4:             # Vérifie qu'il y a exactement quatre parties
+        return False
+    try:
+        return all(0 <= int(part) <= 255 for part in parts)  # Vérifie que chaque partie est un entier entre 0 et 255
+    except ValueError:              # Gère les erreurs si une partie n'est pas un entier
+        return False
+
+
+# Fonction pour valider un VLAN ID
+def is_valid_vlan(vlan):
+    """
+    Vérifie si un VLAN ID est valide (entier entre 1 et 4094).
+    Args:
+        vlan (str): VLAN ID à valider.
+    Returns:
+        bool: True si valide, False sinon.
+    """
+    try:
+        vlan_id = int(vlan)         # Convertit la valeur en entier
+        return 1 <= vlan_id <= 4094 # Vérifie que l'entier est entre 1 et 4094
+    except ValueError:              # Gère les erreurs si la valeur n'est pas un entier
+        return False
+
+
+def site_profile(site, profile=None):
+    """
+    Profil à utiliser pour un site : celui fourni, sinon celui de la colonne "profile" (ou le profil par défaut).
+    Raises:
+        ValueError: Si le profil est inconnu ou invalide.
+    """
+    if profile is None:
+        from profiles import load_profile, PROFILE_FIELD  # Import différé : profiles dépend de ce module
+        profile = load_profile(site.get(PROFILE_FIELD, ""))
+    return profile
+
+
+# Fonction pour valider les champs 2G/3G d'un site
+def plan_script_2g3g(site, profile=None):
+    """
+    Valide les champs 2G/3G d'un site et prépare le rendu du script correspondant.
+    Args:
+        site (dict): Valeurs des champs du site (clés de fields_2g3g).
+        profile (Profile): Profil du site (par défaut, celui de sa colonne "profile").
+    Returns:
+        tuple: (type de script, modèle, valeurs des champs du modèle, nom de fichier par défaut).
+    Raises:
+        ValueError: Si un champ est manquant ou invalide (message identique à celui affiché par la GUI).
+    """
+    # Récupère les données du site
+    nom_station = site.get("nom_station", "")
+    port_number = site.get("port_number_2g3g", "")
+    iub_vlan = site.get("IUB_vlan_number", "")
+    om_vlan = site.get("OM_vlan_number", "")
+    abis_vlan = site.get("ABIS_vlan_number", "")
+    siu_om_vlan = site.get("SIU_OM_vlan_number", "")
+    abis_ip = site.get("ABIS_primary_ip", "")
+    siu_om_ip = site.get("SIU_OM_primary_ip", "")
+    tg_transport = site.get("TG_transport", "")
+
+    # Validation des champs 2G/3G
+    if not all([nom_station, port_number, iub_vlan, om_vlan, abis_vlan, siu_om_vlan, abis_ip, siu_om_ip, tg_transport]):
+        raise ValueError("Tous les champs 2G/3G doivent être remplis !")
+    if not all(is_valid_vlan(v) for v in [iub_vlan, om_vlan, abis_vlan, siu_om_vlan]):
+        raise ValueError("Les VLANs 2G/3G doivent être des entiers entre 1 et 4094 !")
+    if not all(is_valid_ip(ip) for ip in [abis_ip, siu_om_ip]):
+        raise ValueError("Adresses IP 2G/3G invalides !")
+    try:
+        port_number = int(port_number)  # Vérifie que port_number est un entier
+    except ValueError:
+        raise ValueError("Le numéro de port 2G/3G doit être un entier !") from None
+
+    # Valeurs du modèle précompilé 2G/3G
+    values = {
+        "nom_station": nom_station, "port_number": str(port_number), "iub_vlan": iub_vlan,
+        "om_vlan": om_vlan, "abis_vlan": abis_vlan, "siu_om_vlan": siu_om_vlan,
+        "abis_ip": abis_ip, "siu_om_ip": siu_om_ip, "tg_transport": tg_transport,
+    }
+
+    return ("2G3G", site_profile(site, profile).script_2g3g, values, f"siu_{nom_station}_2G3G.txt")
+
+
+# Fonction pour valider les champs 4G d'un site
+def plan_script_4g(site, profile=None):
+    """
+    Valide les champs 4G d'un site et prépare le rendu du script correspondant.
+    Args:
+        site (dict): Valeurs des champs du site (clés de fields_4g).
+        profile (Profile): Profil du site (par défaut, celui de sa colonne "profile").
+    Returns:
+        tuple: (type de script, modèle, valeurs des champs du modèle, nom de fichier par défaut).
+    Raises:
+        ValueError: Si un champ est manquant ou invalide.
+    """
+    # Récupère les données du site
+    nom_station = site.get("nom_station", "")  # Facultatif en 4G, sert uniquement au nom du fichier
+    port_number = site.get("port_number_4g", "")
+    port_id = site.get("port_id", "")
+    s1_up_vlan = site.get("vlan_s1_up", "")
+    s1_cp_vlan = site.get("vlan_s1_cp", "")
+    enodeb_om_vlan = site.get("vlan_enodeB_om", "")
+
+    # Validation des champs 4G
+    if not all([port_number, port_id, s1_up_vlan, s1_cp_vlan, enodeb_om_vlan]):
+        raise ValueError("Tous les champs 4G doivent être remplis !")
+    if not all(is_valid_vlan(v) for v in [s1_up_vlan, s1_cp_vlan, enodeb_om_vlan]):
+        raise ValueError("Les VLANs 4G doivent être des entiers entre 1 et 4094 !")
+    try:
+        port_number = int(port_number)  # Vérifie que port_number est un entier
+    except ValueError:
+        raise ValueError("Le numéro de port 4G doit être un entier !") from None
+
+    # Valeurs du modèle précompilé 4G
+    values = {
+        "port_number": str(port_number), "port_id": port_id, "s1_up_vlan": s1_up_vlan,
+        "s1_cp_vlan": s1_cp_vlan, "enodeb_om_vlan": enodeb_om_vlan,
+    }
+
+    # Nom de fichier par défaut propre au site lorsque la station est connue (évite les collisions)
+    return ("4G", site_profile(site, profile).script_4g, values, f"siu_{nom_station}_4G.txt" if nom_station else "siu_lte_4G.txt")
+
+
+# Fonction pour valider tous les champs d'un site
+def plan_scripts(site, techno, profile=None):
+    """
+    Valide les champs d'un site pour la technologie sélectionnée, sans générer les scripts.
+    Args:
+        site (dict): Valeurs des champs du site (clés de fields_2g3g et fields_4g).
+        techno (str): Technologie sélectionnée ("2G/3G", "4G" ou "Les trois").
+        profile (Profile): Profil du site (par défaut, celui de sa colonne "profile").
+    Returns:
+        list: Liste de tuples (type de script, modèle, valeurs du modèle, nom de fichier par défaut).
+    Raises:
+        ValueError: Si la technologie ou le profil est inconnu, ou si un champ est invalide.
+    """
+    if not techno:
+        raise ValueError("Veuillez sélectionner une technologie !")
+    if techno not in TECHNOLOGIES:
+        raise ValueError(f"Technologie inconnue : {techno}")
+
+    profile = site_profile(site, profile)
+    plans = []
+    if techno in ["2G/3G", "Les trois"]:
+        plans.append(plan_script_2g3g(site, profile))
+    if techno in ["4G", "Les trois"]:
+        plans.append(plan_script_4g(site, profile))
+    return plans
+
+
+def render_plan(plan):
+    """
+    Génère un script à partir d'un rendu préparé par plan_script_2g3g, plan_script_4g ou plan_scripts.
+    Returns:
+        tuple: (type de script, contenu du script, nom de fichier par défaut).
+    """
+    script_type, template, values, default_name = plan
+    return (script_type, template.render(values), default_name)
+
+
+# Fonction pour générer le script 2G/3G d'un site
+def build_script_2g3g(site, profile=None):
+    """
+    Valide les champs 2G/3G d'un site et génère le script correspondant.
+    Returns:
+        tuple: (type de script, contenu du script, nom de fichier par défaut).
+    Raises:
+        ValueError: Si un champ est manquant ou invalide (message identique à celui affiché par la GUI).
+    """
+    return render_plan(plan_script_2g3g(site, profile))
+
+
+# Fonction pour générer le script 4G d'un site
+def build_script_4g(site, profile=None):
+    """
+    Valide les champs 4G d'un site et génère le script correspondant.
+    Returns:
+        tuple: (type de script, contenu du script, nom de fichier par défaut).
+    Raises:
+        ValueError: Si un champ est manquant ou invalide.
+    """
+    return render_plan(plan_script_4g(site, profile))
+
+
+# Fonction pour générer tous les scripts d'un site
+def build_scripts(site, techno, profile=None):
+    """
+    Génère les scripts de configuration d'un site pour la technologie sélectionnée.
+    Args:
+        site (dict): Valeurs des champs du site (clés de fields_2g3g et fields_4g).
+        techno (str): Technologie sélectionnée ("2G/3G", "4G" ou "Les trois").
+        profile (Profile): Profil du site (par défaut, celui de sa colonne "profile").
+    Returns:
+        list: Liste de tuples (type de script, contenu du script, nom de fichier par défaut).
+    Raises:
+        ValueError: Si la technologie ou le profil est inconnu, ou si un champ est invalide.
+    """
+    return [render_plan(plan) for plan in plan_scripts(site, techno, profile)]
@@ -0,0 +1,315 @@
+# Stockage en colonnes d'un inventaire de sites, dans un fichier binaire projeté en mémoire (mmap)
+# Une colonne typée par champ : VLANs et ports en uint16, adresses IP en uint32, chaînes (noms de station,
+# TG_transport, ...) internées dans une table commune. Le fichier s'ouvre sans relire le CSV et peut être
+# partagé sans copie par plusieurs processus (générateur, validation, attribution).
+# Usage : python inventory_store.py inventaire.csv -o inventaire.siuinv    (conversion)
+#         python inventory_store.py inventaire.siuinv                      (description du fichier)
+import argparse                     # Pour l'interface en ligne de commande
+import json                         # Répertoire des colonnes
+import mmap                         # Projection du fichier en mémoire
+import os                           # Pour gérer les fichiers et chemins
+import struct                       # En-tête binaire
+import sys                          # Pour les sorties d'erreur et le code de retour
+from array import array             # Colonnes typées en cours de construction
+
+from validation import IP_FIELDS, PORT_FIELDS, VLAN_FIELDS, format_ip, parse_ip
+
+STORE_EXTENSION = ".siuinv"
+MAGIC = b"SIUINV\x00\x01"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")   # Signature, version, nombre de sites, taille du répertoire
+_SPECIAL = {"H": 0xFFFF, "I": 0xFFFFFFFF}  # Valeur réservée : la valeur d'origine est dans la table des exceptions
+BLOCK_ROWS = 4096                   # Nombre de sites décodés à la fois lors d'un parcours
+_LINE_COLUMN = "_line"              # Numéro de ligne d'origine de chaque site (pour les messages d'erreur)
+
+
+def column_type(name):
+    """
+    Type de stockage d'un champ.
+    Returns:
+        str: "H" (uint16 : VLANs et ports), "I" (uint32 : adresses IP) ou "S" (chaîne internée).
+    """
+    if name in VLAN_FIELDS or name in PORT_FIELDS:
+        return "H"
+    if name in IP_FIELDS:
+        return "I"
+    return "S"
+
+
+def _encode(kind, value):
+    """
+    Convertit une valeur pour une colonne typée.
+    Returns:
+        int: Valeur stockée (0 pour une valeur vide), ou None si la valeur ne s'écrit pas exactement
+            sous forme numérique (elle est alors conservée telle quelle dans la table des exceptions).
+    """
+    if not value:
+        return 0
+    if kind == "I":
+        number = parse_ip(value)
+        ok = number is not None and format_ip(number) == value
+    else:
+        number = int(value) if value.isascii() and value.isdecimal() else None  # "²" est un chiffre pour isdigit()
+        ok = number is not None and str(number) == value  # "007" ou "+7" sont conservés tels quels
+    return number if ok and 0 < number < _SPECIAL[kind] else None
+
+
+def _align(offset):
+    """Arrondit une position au multiple de 8 supérieur (alignement des colonnes)."""
+    return (offset + 7) & ~7
+
+
+def write_store(rows, path):
+    """
+    Construit un fichier d'inventaire en colonnes, en une seule lecture des sites.
+    Args:
+        rows (iterable): Tuples (numéro de ligne, site), par exemple issus de bulk.load_inventory.
+        path (str): Fichier de destination (écrit de façon atomique).
+    Returns:
+        int: Nombre de sites enregistrés.
+    """
+    columns = {}                    # Nom -> (type, array)
+    lines = array("I")
+    strings = {"": 0}               # Chaîne -> indice dans la table
+    exceptions = []                 # [ligne du stockage, nom du champ, valeur d'origine]
+    count = 0
+    for line_no, site in rows:
+        for name, value in site.items():
+            column = columns.get(name)
+            if column is None:
+                kind = column_type(name)
+                data = array("I" if kind == "S" else kind)
+                data.frombytes(bytes(count * data.itemsize))  # Sites précédents sans ce champ : valeur vide
+                column = columns[name] = (kind, data)
+            kind, data = column
+            if kind == "S":
+                index = strings.get(value)
+                if index is None:
+                    index = strings[value] = len(strings)
+                data.append(index)
+                continue
+            number = _encode(kind, value)
+            if number is None:
+                exceptions.append([count, name, value])
+                number = _SPECIAL[kind]
+            data.append(number)
+        count += 1
+        lines.append(line_no)
+        for kind, data in columns.values():
+            if len(data) < count:   # Champ absent de ce site (JSONL)
+                data.append(0)
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for value in strings:           # Ordre d'insertion = ordre des indices
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+
+    # Sections de données, à la suite du répertoire, chacune alignée sur 8 octets
+    sections = [(_LINE_COLUMN, "I", lines.tobytes())]
+    sections += [(name, kind, data.tobytes()) for name, (kind, data) in columns.items()]
+    sections += [("_string_offsets", "I", offsets.tobytes()), ("_string_data", "B", bytes(blob))]
+    directory = {"byteorder": sys.byteorder, "columns": [], "exceptions": exceptions}
+    position = 0
+    for name, kind, payload in sections:
+        directory["columns"].append({"name": name, "type": kind, "offset": position, "length": len(payload)})
+        position = _align(position + len(payload))
+    encoded = json.dumps(directory, ensure_ascii=False).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, count, len(encoded)))
+        f.write(encoded)
+        start = _align(f.tell())
+        for entry, (_, _, payload) in zip(directory["columns"], sections):
+            f.seek(start + entry["offset"])
+            f.write(payload)
+    os.replace(tmp_path, path)
+    return count
+
+
+class InventoryStore:
+    """
+    Inventaire en colonnes ouvert en lecture par projection en mémoire : les colonnes sont des memoryview
+    typées sur le fichier, sans copie ni analyse du contenu.
+    Args:
+        path (str): Fichier .siuinv produit par write_store.
+    Raises:
+        ValueError: Si le fichier n'est pas un inventaire en colonnes compatible.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        self._views = [view]
+        try:
+            magic, version, self.rows, directory_size = _HEADER.unpack_from(view)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Inventaire en colonnes invalide ou d'une autre version : {path}")
+        directory = json.loads(bytes(view[_HEADER.size:_HEADER.size + directory_size]))
+        if directory["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"Inventaire en colonnes produit sur une architecture d'ordre différent : {path}")
+        start = _align(_HEADER.size + directory_size)
+        self.columns = {}           # Nom -> (type, memoryview typée)
+        for entry in directory["columns"]:
+            section = view[start + entry["offset"]:start + entry["offset"] + entry["length"]]
+            typed = section.cast(entry["type"]) if entry["type"] != "S" else section.cast("I")
+            self._views += [section, typed]
+            self.columns[entry["name"]] = (entry["type"], typed)
+        self._lines = self.columns.pop(_LINE_COLUMN)[1]
+        self._string_offsets = self.columns.pop("_string_offsets")[1]
+        self._string_data = self.columns.pop("_string_data")[1]
+        self.fields = list(self.columns)
+        self._exceptions = {(row, name): value for row, name, value in directory["exceptions"]}
+        self._strings = {}          # Chaînes déjà décodées (indice -> str)
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Libère les vues sur le fichier puis la projection en mémoire."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def string(self, index):
+        """Retourne la chaîne d'indice donné de la table des chaînes."""
+        value = self._strings.get(index)
+        if value is None:
+            begin, end = self._string_offsets[index], self._string_offsets[index + 1]
+            value = self._strings[index] = str(self._string_data[begin:end], "utf-8")
+        return value
+
+    def column(self, name):
+        """
+        Colonne brute d'un champ, sans copie.
+        Returns:
+            memoryview: Valeurs uint16 (VLANs, ports ; 0 si vide), uint32 (adresses IP ; 0 si vide)
+                ou indices de la table des chaînes.
+        """
+        return self.columns[name][1]
+
+    def get(self, row, name):
+        """Valeur d'un champ d'un site, sous la forme écrite dans l'inventaire d'origine."""
+        kind, data = self.columns[name]
+        value = data[row]
+        if kind == "S":
+            return self.string(value)
+        if value == 0:
+            return ""
+        if value == _SPECIAL[kind]:
+            return self._exceptions[(row, name)]
+        return format_ip(value) if kind == "I" else str(value)
+
+    def site(self, row):
+        """Reconstitue un site sous forme de dictionnaire (même format que bulk.load_inventory)."""
+        return {name: self.get(row, name) for name in self.fields}
+
+    def iter_rows(self, start=0, stop=None):
+        """
+        Parcourt les sites d'une plage de lignes du stockage.
+        Yields:
+            tuple: (numéro de ligne d'origine, site).
+        """
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for block in range(start, stop, BLOCK_ROWS):
+            end = min(block + BLOCK_ROWS, stop)
+            # Décodage colonne par colonne (une compréhension de liste par champ), puis assemblage des sites
+            decoded = [self._decode(name, block, end) for name in self.fields]
+            for line_no, values in zip(self._lines[block:end], zip(*decoded)):
+                yield line_no, dict(zip(self.fields, values))
+
+    def _decode(self, name, start, stop):
+        """Valeurs textuelles d'un champ pour les lignes [start, stop) du stockage."""
+        kind, data = self.columns[name]
+        raw = data[start:stop]
+        if kind == "S":
+            strings = self._strings
+            return [strings[i] if i in strings else self.string(i) for i in raw]
+        if kind == "I":
+            values = [format_ip(v) if v else "" for v in raw]
+        else:
+            values = [str(v) if v else "" for v in raw]
+        special = _SPECIAL[kind]
+        if special in raw:
+            for offset, v in enumerate(raw):
+                if v == special:
+                    values[offset] = self._exceptions[(start + offset, name)]
+        return values
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    def slices(self, size):
+        """
+        Découpe l'inventaire en tranches transmissibles à des processus de travail : seuls le chemin
+        et les bornes sont copiés, chaque processus lit les sites dans sa propre projection du fichier.
+        """
+        for start in range(0, self.rows, size):
+            yield StoreSlice(self.path, start, start + size)
+
+
+_open_stores = {}                   # Stockages ouverts par un processus : (chemin, date, taille) -> InventoryStore
+
+
+class StoreSlice:
+    """Tranche [start, stop) d'un inventaire en colonnes, parcourue comme une liste de (ligne, site)."""
+    __slots__ = ("path", "start", "stop")
+
+    def __init__(self, path, start, stop):
+        self.path = path
+        self.start = start
+        self.stop = stop
+
+    def __iter__(self):
+        stat = os.stat(self.path)
+        key = (self.path, stat.st_mtime_ns, stat.st_size)  # Un fichier régénéré entre-temps est rouvert
+        store = _open_stores.get(key)
+        if store is None:
+            store = _open_stores[key] = InventoryStore(self.path)
+        return store.iter_rows(self.start, self.stop)
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : conversion d'un inventaire ou description d'un fichier .siuinv"""
+    parser = argparse.ArgumentParser(description="Inventaire de sites en colonnes, projeté en mémoire.")
+    parser.add_argument("inventory", help="Inventaire à convertir (.csv, .jsonl) ou fichier .siuinv à décrire")
+    parser.add_argument("-o", "--output", default=None, help=f"Fichier {STORE_EXTENSION} à produire")
+    args = parser.parse_args(argv)
+
+    from bulk import load_inventory
+    try:
+        if args.output:
+            read_errors = []
+            count = write_store(load_inventory(args.inventory, read_errors), args.output)
+            for error in read_errors:
+                print(f"Ligne {error.line} : {error.message} (ligne ignorée)", file=sys.stderr)
+            print(f"{count} sites enregistrés dans {args.output} ({os.path.getsize(args.output):,} octets)")
+            return 1 if read_errors else 0
+        with InventoryStore(args.inventory) as store:
+            print(f"{len(store)} sites, {len(store._string_offsets) - 1} chaînes distinctes, "
+                  f"{len(store._exceptions)} valeurs non numériques, {os.path.getsize(args.inventory):,} octets")
+            for name, (kind, data) in store.columns.items():
+                label = {"H": "uint16", "I": "uint32 (IPv4)", "S": "chaîne"}[kind]
+                print(f"  {name:22} {label}")
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
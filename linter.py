@@ -0,0 +1,280 @@
+# Vérification des scripts SIU (générés ou anciens) en une seule lecture, ligne par ligne
+# Contrôle le cadre des transactions (starttransaction/commit/endtransaction), les références vers d'autres MO
+# (depbridge, depLinkLayer, depip_interface, forwardinginterface) et les valeurs (tagvalue, adresses IP).
+# Usage : python linter.py scripts/ [archive.zip ...] [--assume STN=0,EthernetInterface=Metro] [-j 4]
+import argparse                     # Pour l'interface en ligne de commande
+import mmap                         # Lecture des gros fichiers sans les charger en mémoire
+import os                           # Pour parcourir les dossiers
+import sys                          # Pour les sorties d'erreur et le code de retour
+import tarfile                      # Archives produites par bulk.py (.tar, .tar.gz, .tgz)
+import zipfile                      # Archives produites par bulk.py (.zip)
+from concurrent.futures import ProcessPoolExecutor  # Pour vérifier un dossier sur plusieurs processus
+from dataclasses import dataclass, field
+from functools import lru_cache     # Les mêmes chemins de MO se répètent d'un script à l'autre
+
+from mo_model import path_key
+from validation import parse_ip, parse_vlan
+
+MMAP_THRESHOLD = 1 << 20            # Au-delà de 1 Mo, le fichier est projeté en mémoire (mmap)
+DEFAULT_EXISTING = ("STN=0",)       # MO toujours présents sur le nœud
+REFERENCE_ATTRIBUTES = frozenset(("depbridge", "deplinklayer", "depip_interface", "forwardinginterface"))
+IP_ATTRIBUTES = frozenset(("primaryip_address", "primarysubnetmask", "defaultgateway", "nexthopipaddress",
+                           "pgw_ip_address", "ts_ip_address", "systemclocktimeserver", "wakeupdestination"))
+COMMANDS = frozenset(("createmo", "setmoattribute", "subscribe", "checkconsistency", "commit",
+                      "starttransaction", "endtransaction"))
+
+_path_key = lru_cache(maxsize=65536)(path_key)
+
+
+@dataclass
+class Finding:
+    """Anomalie détectée dans un script."""
+    path: str                       # Fichier (ou "archive:membre")
+    line: int
+    message: str
+
+
+@dataclass
+class LintReport:
+    """Bilan d'une vérification."""
+    files: int = 0
+    lines: int = 0
+    findings: list = field(default_factory=list)  # Liste de Finding
+
+
+def _check_value(name, value):
+    """
+    Contrôle la valeur d'un attribut connu.
+    Returns:
+        str: Message d'erreur, ou None si la valeur est correcte.
+    """
+    if name == "tagvalue":
+        return None if parse_vlan(value) is not None else f"tagvalue invalide : {value!r} (attendu 1 à 4094)"
+    if name in IP_ATTRIBUTES:
+        return None if parse_ip(value) is not None else f"{name} invalide : {value!r}"
+    if name == "destipsubnet":
+        address, sep, prefix = value.partition("/")
+        if parse_ip(address) is None or not sep or not prefix.isdigit() or int(prefix) > 32:
+            return f"destipsubnet invalide : {value!r}"
+    return None
+
+
+def lint_lines(lines, path, existing=DEFAULT_EXISTING):
+    """
+    Vérifie un script en une seule passe. Les MO créés sont indexés au fil de la lecture ; les références
+    d'une transaction sont résolues à son commit (le nœud contrôle la cohérence à ce moment-là), contre
+    les MO créés dans la transaction, ceux validés par une transaction précédente du même script et
+    les MO supposés présents sur le nœud.
+    Args:
+        lines (iterable): Lignes du script (bytes ou str).
+        path (str): Nom du script (pour les messages).
+        existing (iterable): Chemins des MO déjà présents sur le nœud.
+    Returns:
+        tuple: (nombre de lignes, liste de Finding).
+    """
+    findings = []
+    committed = {path_key(mo) for mo in existing}
+    created = set()                 # MO créés dans la transaction en cours
+    references = []                 # (ligne, attribut, clé, chemin) en attente du commit
+    tags = {}                       # (clé du VLANGroup, tagvalue) -> (clé du vlan, ligne de la première affectation)
+    in_transaction = False
+    pending = False                 # Modifications non encore validées par un commit
+    outside = False                 # Commandes hors transaction déjà signalées
+    line_no = 0
+
+    def report(message, at=None):
+        findings.append(Finding(path, at or line_no, message))
+
+    for line_no, raw in enumerate(lines, 1):
+        text = raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw
+        words = text.split(None, 4)
+        if not words:
+            continue
+        command = words[0].lower()
+        if command not in COMMANDS:
+            report(f"Commande non reconnue : {text.strip()}")
+            continue
+        if command == "endtransaction":
+            if pending:
+                report("endtransaction sans commit : les modifications de la transaction sont perdues")
+            in_transaction = pending = outside = False
+            created.clear()
+            references.clear()
+            continue
+        if command == "starttransaction":
+            if in_transaction:
+                report("starttransaction alors qu'une transaction est déjà ouverte")
+            in_transaction, pending, outside = True, False, False
+            continue
+        if not in_transaction and not outside:
+            report(f"{words[0]} hors transaction (starttransaction manquant)")
+            outside = True          # Une seule anomalie pour toute la suite de commandes
+        if command == "commit":
+            for at, name, key, target in references:
+                if key not in created and key not in committed:
+                    report(f"{name} fait référence à un MO inexistant : {target}", at)
+            committed |= created
+            created.clear()
+            references.clear()
+            pending = False
+            continue
+        if command in ("subscribe", "checkconsistency"):
+            continue
+
+        pending = True
+        if len(words) < 3 or (command == "setmoattribute" and len(words) < 4):
+            report(f"Commande incomplète : {text.strip()}")
+            continue
+        try:
+            key = _path_key(words[2])
+        except ValueError as e:
+            report(str(e))
+            continue
+        if command == "createmo":
+            if key in created:
+                report(f"MO créé deux fois dans la même transaction : {words[2]}")
+            created.add(key)
+            continue
+
+        name = words[3].lower()
+        value = words[4].strip() if len(words) == 5 else ""
+        if name in REFERENCE_ATTRIBUTES:
+            try:
+                references.append((line_no, words[3], _path_key(value), value))
+            except ValueError:
+                report(f"{words[3]} : chemin de MO invalide : {value!r}")
+            continue
+        message = _check_value(name, value)
+        if message:
+            report(message)
+        elif name == "tagvalue" and key[:-1]:
+            tag = (key[:-1], int(value))   # Deux VLAN d'un même VLANGroup ne partagent pas un tagvalue
+            owner, first = tags.setdefault(tag, (key, line_no))
+            if owner != key:
+                report(f"tagvalue {value} déjà utilisé dans {words[2].rsplit(',', 1)[0]} (ligne {first})")
+
+    if pending:
+        report("Fin du script avec des modifications non validées (commit manquant)")
+    return line_no, findings
+
+
+def _file_lines(path):
+    """Lit les lignes d'un fichier, projeté en mémoire s'il est volumineux."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield from f.read().splitlines()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+
+def lint_file(path, existing=DEFAULT_EXISTING):
+    """Vérifie un fichier de script. Returns: tuple (nombre de lignes, liste de Finding)."""
+    return lint_lines(_file_lines(path), path, existing)
+
+
+def _lint_file_task(args):
+    """Tâche exécutée dans un processus de travail."""
+    return lint_file(*args)
+
+
+def iter_archive(path):
+    """
+    Parcourt les scripts d'une archive zip ou tar sans l'extraire.
+    Yields:
+        tuple: (nom "archive:membre", fichier binaire du membre).
+    """
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    with archive.open(info) as member:
+                        yield f"{path}:{info.filename}", member
+    else:
+        with tarfile.open(path, "r:*") as archive:   # Lecture en flux, membre par membre
+            for info in archive:
+                if info.isfile():
+                    yield f"{path}:{info.name}", archive.extractfile(info)
+
+
+def _script_files(root):
+    """Liste les fichiers .txt d'un dossier (récursivement), dans un ordre stable."""
+    for folder, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".txt"):
+                yield os.path.join(folder, name)
+
+
+def lint_paths(paths, existing=DEFAULT_EXISTING, workers=None):
+    """
+    Vérifie des scripts, dossiers de scripts (répartis sur un ProcessPoolExecutor) et archives.
+    Args:
+        paths (list): Fichiers, dossiers ou archives (.zip, .tar, .tar.gz, .tgz).
+        existing (iterable): Chemins des MO déjà présents sur le nœud.
+        workers (int): Nombre de processus (par défaut le nombre de cœurs ; 1 pour tout traiter sur place).
+    Returns:
+        LintReport: Bilan de la vérification.
+    """
+    report = LintReport()
+    existing = tuple(existing)
+    workers = workers or os.cpu_count() or 1
+
+    def add(result):
+        report.files += 1
+        report.lines += result[0]
+        report.findings.extend(result[1])
+
+    for path in paths:
+        if os.path.isdir(path):
+            tasks = ((name, existing) for name in _script_files(path))
+            if workers == 1:
+                for task in tasks:
+                    add(_lint_file_task(task))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for result in executor.map(_lint_file_task, tasks, chunksize=64):
+                        add(result)
+        elif path.lower().endswith((".zip", ".tar", ".tar.gz", ".tgz")):
+            for name, member in iter_archive(path):
+                add(lint_lines(member, name, existing))
+        else:
+            add(lint_file(path, existing))
+    return report
+
+
+def _load_existing(args):
+    """Assemble la liste des MO supposés présents sur le nœud (options --assume et --existing)."""
+    existing = list(DEFAULT_EXISTING) + args.assume
+    if args.existing:
+        with open(args.existing, encoding="utf-8") as f:
+            existing += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    for mo in existing:
+        path_key(mo)                # Valide les chemins avant de lancer la vérification
+    return existing
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : python linter.py scripts/"""
+    parser = argparse.ArgumentParser(description="Vérifie des scripts SIU (cadre des transactions, références, valeurs).")
+    parser.add_argument("paths", nargs="+", help="Scripts, dossiers ou archives (.zip, .tar, .tar.gz)")
+    parser.add_argument("--assume", action="append", default=[], metavar="MO",
+                        help="MO déjà présent sur le nœud (ex. STN=0,EthernetInterface=Metro)")
+    parser.add_argument("--existing", default=None, help="Fichier listant les MO présents sur le nœud (un par ligne)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Nombre de processus pour les dossiers")
+    args = parser.parse_args(argv)
+
+    try:
+        report = lint_paths(args.paths, _load_existing(args), args.workers)
+    except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    for finding in report.findings:
+        print(f"{finding.path}:{finding.line}: {finding.message}")
+    print(f"{report.files} scripts, {report.lines} lignes, {len(report.findings)} anomalies", file=sys.stderr)
+    return 1 if report.findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
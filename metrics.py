@@ -0,0 +1,208 @@
+# Instrumentation du pipeline de génération : durée de chaque étape (lecture, validation, rendu, écriture)
+# et compteurs (sites traités, échecs de validation, octets écrits), exportables en JSON ou au format
+# texte Prometheus. Désactivée, l'instrumentation se réduit à un appel de méthode sans effet.
+import json                         # Export JSON
+import sys                          # Pour le résumé du profilage
+import time                         # Pour mesurer la durée des étapes
+from bisect import bisect_left      # Recherche de l'intervalle d'un histogramme
+
+STAGES = ("read", "validate", "render", "write")
+# Bornes supérieures des intervalles des histogrammes (secondes) : de 1 µs à 10 s
+BUCKETS = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0,)
+PREFIX = "siu"                      # Préfixe des métriques Prometheus
+
+
+class _NullStage:
+    """Contexte sans effet, utilisé lorsque l'instrumentation est désactivée."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Contexte qui mesure la durée d'une étape et l'ajoute à son histogramme."""
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Histogram:
+    """Répartition des durées d'une étape dans les intervalles de BUCKETS (nombre par intervalle, somme)."""
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Dernier intervalle : au-delà de la plus grande borne
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Ajoute une mesure (secondes)."""
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, data):
+        """Ajoute les mesures d'un histogramme exporté par to_dict (par exemple d'un processus de travail)."""
+        for i, n in enumerate(data["counts"]):
+            self.counts[i] += n
+        self.total += data["sum"]
+        self.count += data["count"]
+
+    def to_dict(self):
+        """Exporte l'histogramme sous forme de dictionnaire (sérialisable)."""
+        return {"counts": list(self.counts), "sum": self.total, "count": self.count}
+
+
+class Metrics:
+    """
+    Histogrammes des étapes et compteurs d'une exécution.
+    Args:
+        enabled (bool): Si False, stage() et add() n'ont aucun effet (coût quasi nul).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.histograms = {}        # Étape -> Histogram
+        self.counters = {}          # Nom -> valeur
+
+    def stage(self, name):
+        """
+        Contexte mesurant la durée d'une étape.
+        Exemple : with metrics.stage("render"): ...
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return _Stage(histogram)
+
+    def add(self, name, value=1):
+        """Incrémente un compteur."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def timed(self, name, iterable):
+        """Parcourt un itérable en mesurant le temps d'obtention de chaque élément (ex. lecture de l'inventaire)."""
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        histogram = self.histograms.setdefault(name, Histogram())
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            histogram.observe(time.perf_counter() - start)
+            yield item
+
+    def snapshot(self):
+        """Exporte les mesures sous une forme sérialisable (renvoyée par les processus de travail)."""
+        return {"stages": {name: h.to_dict() for name, h in self.histograms.items()}, "counters": dict(self.counters)}
+
+    def merge(self, snapshot):
+        """Ajoute les mesures d'un snapshot (par exemple celui d'un processus de travail)."""
+        if not snapshot:
+            return
+        for name, data in snapshot["stages"].items():
+            self.histograms.setdefault(name, Histogram()).merge(data)
+        for name, value in snapshot["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_json(self):
+        """Export JSON : histogrammes (avec les bornes des intervalles) et compteurs."""
+        snapshot = self.snapshot()
+        snapshot["buckets"] = list(BUCKETS)
+        return json.dumps(snapshot, indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Export au format texte Prometheus (histogramme siu_stage_seconds et compteurs siu_*_total)."""
+        lines = [f"# HELP {PREFIX}_stage_seconds Durée des étapes du pipeline de génération",
+                 f"# TYPE {PREFIX}_stage_seconds histogram"]
+        for name in sorted(self.histograms, key=lambda n: (STAGES.index(n) if n in STAGES else len(STAGES), n)):
+            histogram = self.histograms[name]
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), histogram.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {histogram.total!r}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {histogram.count}')
+        for name in sorted(self.counters):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {self.counters[name]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Écrit les mesures : format Prometheus pour .prom ou .txt, JSON sinon."""
+        content = self.to_prometheus() if path.lower().endswith((".prom", ".txt")) else self.to_json() + "\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def summary(self):
+        """Résumé lisible : durée totale et moyenne de chaque étape, puis compteurs."""
+        lines = []
+        for name, histogram in self.histograms.items():
+            mean = histogram.total / histogram.count if histogram.count else 0.0
+            lines.append(f"{name:10} {histogram.total:9.3f} s  ({histogram.count} mesures, {mean * 1e6:,.1f} µs en moyenne)")
+        lines += [f"{name:20} {value:,}" for name, value in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+
+# Instrumentation désactivée, partagée par les appels qui n'en fournissent pas
+DISABLED = Metrics(enabled=False)
+
+
+def profile_call(mode, output, func, *args, **kwargs):
+    """
+    Exécute une fonction sous profilage et enregistre le résultat.
+    Args:
+        mode (str): "cpu" (cProfile) ou "memory" (tracemalloc).
+        output (str): Fichier de résultat (statistiques pstats pour "cpu", texte pour "memory").
+        func: Fonction à exécuter, avec ses arguments.
+    Returns:
+        Valeur renvoyée par la fonction.
+    """
+    if mode not in ("cpu", "memory"):
+        raise ValueError(f"Mode de profilage inconnu : {mode} (attendu cpu ou memory)")
+    if mode == "cpu":
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            profiler.dump_stats(output)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+    import tracemalloc
+    tracemalloc.start(25)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = snapshot.statistics("lineno")
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(f"Mémoire allouée : {current / 2**20:.1f} Mo (maximum {peak / 2**20:.1f} Mo)\n")
+            for stat in stats[:50]:
+                f.write(f"{stat}\n")
+        print(f"Mémoire maximale : {peak / 2**20:.1f} Mo, détail dans {output}", file=sys.stderr)
@@ -0,0 +1,201 @@
+# Modèle en mémoire des objets gérés (MO) d'une SIU, construit à partir des commandes d'un script
+# Il fusionne les attributs répétés et les objets communs à plusieurs scripts, puis réémet
+# un flux de commandes minimal, dans l'ordre d'origine, éventuellement en une seule transaction.
+
+
+def parse_path(path):
+    """
+    Découpe le chemin d'un MO en couples (classe, identifiant).
+    Args:
+        path (str): Chemin du MO (ex. "STN=0,VLANGroup=Metro,vlan=Iub").
+    Returns:
+        tuple: Couples (classe, identifiant) tels qu'écrits dans le script.
+    Raises:
+        ValueError: Si un élément du chemin n'est pas de la forme classe=identifiant.
+    """
+    parts = []
+    for item in path.split(","):
+        cls, sep, ident = item.partition("=")
+        if not sep or not cls or not ident:
+            raise ValueError(f"Chemin de MO invalide : {path}")
+        parts.append((cls, ident))
+    return tuple(parts)
+
+
+def path_key(path):
+    """
+    Clé de comparaison d'un chemin de MO : les noms de classe ne tiennent pas compte de la casse
+    (les scripts écrivent indifféremment "stn=0" et "STN=0").
+    """
+    return tuple((cls.lower(), ident) for cls, ident in parse_path(path))
+
+
+class MONode:
+    """Objet géré de l'arbre : chemin, enfants et attributs (dernière valeur affectée)."""
+    __slots__ = ("path", "children", "attributes", "created")
+
+    def __init__(self, path):
+        self.path = path            # Chemin tel qu'écrit la première fois
+        self.children = {}          # Clé (classe en minuscules, identifiant) -> MONode
+        self.attributes = {}        # Nom en minuscules -> (nom tel qu'écrit, valeur)
+        self.created = False        # True si le script crée l'objet (createmo)
+
+
+class MOTree:
+    """
+    Arbre des MO d'une ou plusieurs transactions. Les commandes sont appliquées dans l'ordre du script ;
+    serialize() produit ensuite un script équivalent sans commande redondante.
+    """
+    __slots__ = ("root", "_nodes", "_order", "subscriptions", "checkconsistency", "forcedcommit", "endtransaction")
+
+    def __init__(self):
+        self.root = MONode("")
+        self._nodes = {}            # Clé complète du chemin -> MONode
+        self._order = []            # MO dans l'ordre de leur première commande
+        self.subscriptions = []     # Lignes subscribe (sans doublon)
+        self.checkconsistency = False
+        self.forcedcommit = False
+        self.endtransaction = False  # True si une transaction se termine par endtransaction après commit
+
+    def node(self, path):
+        """
+        Retourne le MO d'un chemin, en créant dans l'arbre les MO intermédiaires manquants.
+        Args:
+            path (str): Chemin du MO.
+        Returns:
+            MONode: Objet correspondant.
+        """
+        key = path_key(path)
+        node = self._nodes.get(key)
+        if node is not None:
+            return node
+        parts = parse_path(path)
+        parent = self.root
+        for depth in range(1, len(key) + 1):
+            child = parent.children.get(key[depth - 1])
+            if child is None:
+                child = parent.children[key[depth - 1]] = MONode(",".join(f"{c}={i}" for c, i in parts[:depth]))
+                self._nodes[key[:depth]] = child
+            parent = child
+        return parent
+
+    def _touch(self, node):
+        """Place le MO dans l'ordre d'émission lors de sa première commande."""
+        if not node.created and not node.attributes:
+            self._order.append(node)
+
+    def create(self, path):
+        """Applique une commande createmo."""
+        node = self.node(path)
+        self._touch(node)
+        node.created = True
+
+    def set_attribute(self, path, name, value):
+        """Applique une commande setmoattribute (une nouvelle valeur remplace la précédente)."""
+        node = self.node(path)
+        self._touch(node)
+        key = name.lower()
+        previous = node.attributes.get(key)
+        node.attributes[key] = (previous[0] if previous else name, value)
+
+    def apply(self, line):
+        """
+        Applique une ligne de script à l'arbre.
+        Args:
+            line (str): Commande (createmo, setmoattribute, subscribe, commit, ...).
+        Raises:
+            ValueError: Si la commande n'est pas reconnue.
+        """
+        words = line.split(None, 4)
+        if not words:
+            return
+        command = words[0].lower()
+        if command == "createmo" and len(words) == 3:
+            self.create(words[2])
+        elif command == "setmoattribute" and len(words) >= 4:
+            self.set_attribute(words[2], words[3], words[4] if len(words) == 5 else "")
+        elif command == "subscribe":
+            if line.strip() not in self.subscriptions:
+                self.subscriptions.append(line.strip())
+        elif command == "commit":
+            self.forcedcommit = self.forcedcommit or "forcedcommit" in (w.lower() for w in words[2:])
+            self.endtransaction = False
+        elif command == "endtransaction":
+            self.endtransaction = True
+        elif command == "checkconsistency":
+            self.checkconsistency = True
+        elif command != "starttransaction":
+            raise ValueError(f"Commande non reconnue : {line.strip()}")
+
+    def load(self, script_content):
+        """Applique toutes les lignes d'un script."""
+        ended = self.endtransaction  # Conservé si un script déjà chargé se terminait par endtransaction
+        self.endtransaction = False
+        for line in script_content.splitlines():
+            self.apply(line)
+        self.endtransaction = ended or self.endtransaction
+
+    def commands(self):
+        """
+        Produit les commandes de configuration minimales : chaque MO créé une seule fois,
+        chaque attribut affecté une seule fois avec sa dernière valeur, dans l'ordre d'origine.
+        Yields:
+            list: Lignes de commande d'un MO.
+        """
+        for node in self._order:
+            lines = [f"createmo t {node.path}"] if node.created else []
+            lines += [f"setmoattribute t {node.path} {name} {value}".rstrip() for name, value in node.attributes.values()]
+            yield lines
+
+    def serialize(self):
+        """
+        Produit le script complet : une seule transaction, suivie de checkconsistency et commit
+        si l'un des scripts d'origine les contenait.
+        Returns:
+            str: Contenu du script.
+        """
+        blocks = ["endtransaction t", "starttransaction t"]
+        if self.subscriptions:
+            blocks.append("\n".join(self.subscriptions))
+        created_only = []           # Créations sans attribut consécutives, regroupées dans un même bloc
+        for lines in self.commands():
+            if len(lines) == 1 and lines[0].startswith("createmo"):
+                created_only.append(lines[0])
+                continue
+            if created_only:
+                blocks.append("\n".join(created_only))
+                created_only = []
+            blocks.append("\n".join(lines))
+        if created_only:
+            blocks.append("\n".join(created_only))
+        if self.checkconsistency:
+            blocks.append("checkconsistency t")
+        blocks.append("commit t forcedcommit" if self.forcedcommit else "commit t")
+        if self.endtransaction:
+            blocks.append("endtransaction t")
+        return "\n\n".join(blocks) + "\n"
+
+
+def minimize_scripts(scripts, combine=False):
+    """
+    Réécrit des scripts générés sous forme minimale (attributs et MO en double fusionnés).
+    Args:
+        scripts (list): Tuples (type de script, contenu, nom de fichier par défaut), comme build_scripts.
+        combine (bool): Regroupe tous les scripts en une seule transaction (ex. "Les trois").
+    Returns:
+        list: Tuples (type de script, contenu, nom de fichier par défaut).
+    """
+    if combine and len(scripts) > 1:
+        tree = MOTree()
+        for _, script_content, _ in scripts:
+            tree.load(script_content)
+        script_type = "_".join(script_type for script_type, _, _ in scripts)
+        default_name = scripts[0][2].replace(f"_{scripts[0][0]}.", f"_{script_type}.")
+        return [(script_type, tree.serialize(), default_name)]
+
+    minimized = []
+    for script_type, script_content, default_name in scripts:
+        tree = MOTree()
+        tree.load(script_content)
+        minimized.append((script_type, tree.serialize(), default_name))
+    return minimized
@@ -0,0 +1,201 @@
+# Profils de région ou de constructeur, lus depuis profiles/<nom>.json
+# Un profil regroupe les valeurs communes à tous les sites d'une région (serveurs NTP, passerelles, route Abis...)
+# et les valeurs proposées par défaut dans les champs de saisie. Chaque profil est validé puis compilé une seule
+# fois en modèles partiellement remplis, conservés dans un cache LRU indexé par l'empreinte de son contenu.
+# Usage : python profiles.py [nom ou fichier ...]   (vérifie les profils, par défaut tous ceux du dossier)
+import hashlib                      # Empreinte du contenu d'un profil
+import os                           # Pour gérer les fichiers et chemins
+import sys                          # Pour les sorties d'erreur et le code de retour
+from collections import OrderedDict  # Ordre d'utilisation des profils compilés (éviction des plus anciens)
+
+from generation import fields_2g3g, fields_4g, is_valid_ip
+from templates import SCRIPT_2G3G, SCRIPT_4G
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+PROFILE_EXTENSION = ".json"
+DEFAULT_PROFILE = "default"
+PROFILE_FIELD = "profile"           # Colonne facultative de l'inventaire : profil du site
+CACHE_SIZE = 32                     # Nombre de profils compilés conservés
+IP_CONSTANTS = ("management_ip", "clock_server", "siu_om_gateway", "pgw_ip", "abis_nexthop",
+                "ntp0_ip", "ntp1_ip", "ntp2_ip")
+MASK_CONSTANTS = ("subnet_mask",)
+SUBNET_CONSTANTS = ("abis_route",)
+CONSTANTS = IP_CONSTANTS + MASK_CONSTANTS + SUBNET_CONSTANTS
+PORT_DEFAULTS = ("port_number_2g3g", "port_number_4g")
+
+_compiled = OrderedDict()           # Empreinte du contenu -> Profile
+_loaded = {}                        # Chemin du fichier -> (date de modification, taille, Profile)
+
+
+class Profile:
+    """
+    Profil validé et compilé : constantes, valeurs par défaut des champs et modèles où les constantes sont fixées.
+    Deux fichiers de même contenu partagent le même Profile.
+    """
+    __slots__ = ("digest", "description", "constants", "defaults", "script_2g3g", "script_4g")
+
+    def __init__(self, digest, description, constants, defaults):
+        self.digest = digest        # Empreinte SHA-256 du fichier (entre dans l'empreinte des sites, voir cache.py)
+        self.description = description
+        self.constants = constants
+        self.defaults = defaults    # Champ de saisie -> valeur proposée par défaut
+        self.script_2g3g = SCRIPT_2G3G.bind(constants)
+        self.script_4g = SCRIPT_4G.bind(constants)
+
+
+def _ip_value(ip):
+    """Convertit une adresse IP déjà validée en entier 32 bits."""
+    a, b, c, d = (int(part) for part in ip.split("."))
+    return a << 24 | b << 16 | c << 8 | d
+
+
+def validate_profile(data):
+    """
+    Contrôle le contenu d'un profil (dictionnaire lu depuis son fichier JSON).
+    Returns:
+        list: Messages d'erreur (vide si le profil est valide).
+    """
+    if not isinstance(data, dict):
+        return ["le profil doit être un objet JSON"]
+    errors = []
+    constants = data.get("constants")
+    defaults = data.get("defaults", {})
+    if not isinstance(constants, dict):
+        return ["section constants manquante ou invalide"]
+    if not isinstance(defaults, dict):
+        errors.append("section defaults invalide")
+        defaults = {}
+
+    for name in CONSTANTS:
+        if not isinstance(constants.get(name), str) or not constants[name]:
+            errors.append(f"constante {name} manquante ou invalide")
+    for name in constants.keys() - set(CONSTANTS):
+        errors.append(f"constante inconnue : {name}")
+    for name in IP_CONSTANTS + MASK_CONSTANTS:
+        value = constants.get(name)
+        if isinstance(value, str) and value and not is_valid_ip(value):
+            errors.append(f"{name} : adresse IP invalide ({value})")
+    for name in MASK_CONSTANTS:
+        value = constants.get(name)
+        if isinstance(value, str) and value and is_valid_ip(value):
+            host = ~_ip_value(value) & 0xFFFFFFFF
+            if host & (host + 1):   # Les bits à 1 du masque doivent être contigus
+                errors.append(f"{name} : masque de sous-réseau invalide ({value})")
+    for name in SUBNET_CONSTANTS:
+        value = constants.get(name)
+        if isinstance(value, str) and value:
+            address, sep, prefix = value.partition("/")
+            if not address or not is_valid_ip(address) or not sep or not prefix.isdigit() or int(prefix) > 32:
+                errors.append(f"{name} : sous-réseau invalide ({value}, attendu adresse/préfixe)")
+
+    for name, value in defaults.items():
+        if name not in fields_2g3g and name not in fields_4g:
+            errors.append(f"valeur par défaut pour un champ inconnu : {name}")
+        elif not isinstance(value, str):
+            errors.append(f"valeur par défaut de {name} : chaîne attendue")
+        elif name in PORT_DEFAULTS and not value.isdigit():
+            errors.append(f"valeur par défaut de {name} : entier attendu ({value})")
+    return errors
+
+
+def compile_profile(content, name=DEFAULT_PROFILE):
+    """
+    Valide et compile le contenu d'un profil, ou le reprend du cache si le même contenu a déjà été compilé.
+    Args:
+        content (bytes): Contenu du fichier de profil (JSON).
+        name (str): Nom du profil (pour les messages d'erreur).
+    Returns:
+        Profile: Profil compilé.
+    Raises:
+        ValueError: Si le profil est illisible ou invalide.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    profile = _compiled.get(digest)
+    if profile is not None:
+        _compiled.move_to_end(digest)
+        return profile
+
+    import json                     # Chargé à la première compilation (json charge le module re)
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Profil {name} illisible : {e}") from None
+    errors = validate_profile(data)
+    if errors:
+        raise ValueError(f"Profil {name} invalide : " + " ; ".join(errors))
+    profile = Profile(digest, data.get("description", ""), dict(data["constants"]), dict(data.get("defaults", {})))
+    _compiled[digest] = profile
+    if len(_compiled) > CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return profile
+
+
+def profile_path(name):
+    """Chemin du fichier d'un profil : nom d'un profil du dossier profiles/, ou chemin d'un fichier .json."""
+    if name.lower().endswith(PROFILE_EXTENSION) or os.sep in name or "/" in name:
+        return name
+    return os.path.join(PROFILE_DIR, name + PROFILE_EXTENSION)
+
+
+def load_profile(name=""):
+    """
+    Charge un profil. Le fichier n'est relu que s'il a changé depuis le dernier appel (date et taille),
+    et n'est analysé et compilé qu'une fois par contenu.
+    Args:
+        name (str): Nom du profil ou chemin de son fichier (vide : profil par défaut).
+    Returns:
+        Profile: Profil compilé.
+    Raises:
+        ValueError: Si le profil n'existe pas ou s'il est invalide.
+    """
+    name = name or DEFAULT_PROFILE
+    path = profile_path(name)
+    try:
+        stat = os.stat(path)
+        loaded = _loaded.get(path)
+        if loaded is not None and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+            return loaded[2]
+        with open(path, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        raise ValueError(f"Profil inconnu : {name}") from None
+    except OSError as e:
+        raise ValueError(f"Profil {name} illisible : {e}") from None
+    profile = compile_profile(content, name)
+    _loaded[path] = (stat.st_mtime_ns, stat.st_size, profile)
+    return profile
+
+
+def list_profiles():
+    """Noms des profils du dossier profiles/, profil par défaut en tête (liste déroulante de la GUI)."""
+    try:
+        names = sorted(os.path.splitext(entry)[0] for entry in os.listdir(PROFILE_DIR)
+                       if entry.lower().endswith(PROFILE_EXTENSION))
+    except FileNotFoundError:
+        return [DEFAULT_PROFILE]
+    if DEFAULT_PROFILE in names:
+        names.remove(DEFAULT_PROFILE)
+    return [DEFAULT_PROFILE] + names
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : vérifie des profils et affiche leur empreinte."""
+    import argparse                 # Chargé à la demande : le module est importé au démarrage de la GUI
+    parser = argparse.ArgumentParser(description="Vérifie des profils de région et affiche leur empreinte.")
+    parser.add_argument("names", nargs="*", metavar="profil", help="Noms ou fichiers de profil (défaut : dossier profiles/)")
+    args = parser.parse_args(argv)
+    failed = 0
+    for name in args.names or list_profiles():
+        try:
+            profile = load_profile(name)
+        except ValueError as e:
+            print(f"Erreur : {e}", file=sys.stderr)
+            failed += 1
+            continue
+        description = f" ({profile.description})" if profile.description else ""
+        print(f"{name} : {profile.digest[:12]}{description}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
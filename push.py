@@ -0,0 +1,309 @@
+# Envoi des scripts générés vers les nœuds SIU, sans passer par des fichiers intermédiaires
+# Les sessions TCP sont réutilisées d'un site à l'autre, la concurrence est bornée, chaque échange avec
+# un nœud a un délai maximal et les échecs de transport sont retentés. Le résultat de chaque commit est collecté.
+import argparse                     # Pour l'interface en ligne de commande
+import asyncio                      # Pour envoyer les scripts à plusieurs nœuds en parallèle
+import json                         # Pour le rapport d'envoi
+import sys                          # Pour les sorties d'erreur et le code de retour
+import time                         # Pour mesurer la durée des envois
+from dataclasses import asdict, dataclass, field
+
+from bulk import iter_generated, load_inventory
+from generation import TECHNOLOGIES
+
+ADDRESS_FIELD = "node_address"      # Colonne facultative de l'inventaire : adresse du nœud (hôte ou hôte:port)
+DEFAULT_PORT = 7300                 # Port des nœuds lorsque l'adresse n'en précise pas
+DEFAULT_CONCURRENCY = 64            # Nombre maximal de sites traités simultanément
+DEFAULT_TIMEOUT = 30.0              # Délai maximal d'une connexion ou d'une réponse (secondes)
+DEFAULT_RETRIES = 2                 # Nouvelles tentatives après un échec de transport
+DEFAULT_BACKOFF = 0.5               # Attente avant la première nouvelle tentative (doublée ensuite)
+MAX_IDLE = 4                        # Sessions inactives conservées par nœud
+
+
+@dataclass
+class PushResult:
+    """Résultat de l'envoi d'un script à un nœud."""
+    line: int                       # Numéro de ligne dans l'inventaire
+    nom_station: str
+    script_type: str                # "2G3G", "4G", ... (vide si le script n'a pas pu être généré)
+    address: str
+    ok: bool
+    message: str                    # Réponse du nœud au commit, ou cause de l'échec
+    attempts: int = 0
+    elapsed: float = 0.0
+    skipped: bool = False           # Non envoyé : un script précédent du même site a échoué
+
+
+@dataclass
+class PushReport:
+    """Bilan d'un envoi."""
+    sites: int = 0
+    committed: int = 0              # Scripts acceptés par le nœud
+    failed: int = 0                 # Scripts refusés, non générés ou non transmis
+    skipped: int = 0                # Scripts non envoyés après l'échec d'un script précédent du site
+    connections: int = 0            # Sessions TCP ouvertes
+    elapsed: float = 0.0
+    results: list = field(default_factory=list)  # Liste de PushResult
+
+    def to_dict(self):
+        """Retourne le rapport sous forme de dictionnaire (pour l'export JSON)."""
+        return asdict(self)
+
+
+def parse_address(address, default_port=DEFAULT_PORT):
+    """
+    Découpe une adresse de nœud "hôte" ou "hôte:port".
+    Returns:
+        tuple: (hôte, port).
+    Raises:
+        ValueError: Si le port est invalide.
+    """
+    host, sep, port = address.rpartition(":")
+    if not sep:
+        return address, default_port
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Adresse de nœud invalide : {address}")
+    return host, int(port)
+
+
+class SessionPool:
+    """
+    Sessions TCP ouvertes vers les nœuds, réutilisées d'une transaction à l'autre.
+    Args:
+        timeout (float): Délai maximal d'ouverture d'une connexion.
+        max_idle (int): Nombre de sessions inactives conservées par nœud.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_idle=MAX_IDLE):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.opened = 0
+        self._idle = {}             # (hôte, port) -> liste de (reader, writer)
+
+    async def acquire(self, address):
+        """Retourne une session inactive vers le nœud, ou en ouvre une nouvelle."""
+        idle = self._idle.get(address)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()          # Session fermée par le nœud entre-temps
+        session = await asyncio.wait_for(asyncio.open_connection(*address), self.timeout)
+        self.opened += 1
+        return session
+
+    def release(self, address, session, reusable=True):
+        """Rend une session au pool, ou la ferme si elle n'est plus dans un état sûr."""
+        idle = self._idle.setdefault(address, [])
+        if reusable and len(idle) < self.max_idle:
+            idle.append(session)
+        else:
+            session[1].close()
+
+    async def close(self):
+        """Ferme toutes les sessions inactives."""
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+            for _, writer in idle:
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+        self._idle.clear()
+
+
+async def send_script(pool, address, script_content, timeout=DEFAULT_TIMEOUT):
+    """
+    Transmet un script sur une session du pool et attend la réponse du nœud à chaque commit.
+    Args:
+        pool (SessionPool): Sessions ouvertes.
+        address (tuple): (hôte, port) du nœud.
+        script_content (str): Contenu du script.
+        timeout (float): Délai maximal d'envoi et de chaque réponse.
+    Returns:
+        tuple: (True si tous les commits sont acceptés, réponse du nœud).
+    Raises:
+        OSError, asyncio.TimeoutError: En cas d'échec de transport (la session est alors fermée).
+    """
+    commits = sum(1 for line in script_content.splitlines() if line.lstrip().lower().startswith("commit"))
+    session = await pool.acquire(address)
+    reader, writer = session
+    replies = []
+    try:
+        writer.write(script_content.encode("utf-8"))
+        await asyncio.wait_for(writer.drain(), timeout)
+        for _ in range(commits):
+            reply = await asyncio.wait_for(reader.readline(), timeout)
+            if not reply:
+                raise ConnectionError("Connexion fermée par le nœud avant la réponse au commit")
+            replies.append(reply.decode("utf-8", "replace").strip())
+    except BaseException:
+        pool.release(address, session, reusable=False)
+        raise
+    pool.release(address, session)
+    ok = all(reply.startswith("OK") for reply in replies)
+    return ok, "; ".join(replies)
+
+
+async def _push_one(pool, line_no, nom_station, script_type, address, script_content, options):
+    """Envoie un script en retentant les échecs de transport (un refus du nœud n'est pas retenté)."""
+    start = time.perf_counter()
+    label = f"{address[0]}:{address[1]}"
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            ok, message = await send_script(pool, address, script_content, options["timeout"])
+        except (OSError, asyncio.TimeoutError) as e:
+            if attempt > options["retries"]:
+                message = f"Échec de transport après {attempt} tentatives : {str(e) or type(e).__name__}"
+                return PushResult(line_no, nom_station, script_type, label, False, message,
+                                  attempt, time.perf_counter() - start)
+            await asyncio.sleep(options["backoff"] * 2 ** (attempt - 1))
+        else:
+            return PushResult(line_no, nom_station, script_type, label, ok, message,
+                              attempt, time.perf_counter() - start)
+
+
+async def _worker(queue, pool, report, options):
+    """
+    Traite les sites de la file : les scripts d'un même site sont envoyés dans l'ordre.
+    Après un échec (refus ou transport), les scripts suivants du site ne sont pas envoyés :
+    le script 4G dépend d'objets créés par le script 2G/3G (EthernetInterface=Metro).
+    """
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        line_no, nom_station, scripts, error, address = item
+        if error is not None:
+            report.results.append(PushResult(line_no, nom_station, "", address or "", False, error))
+            continue
+        failed = None
+        for script_type, script_content, _ in scripts:
+            if failed is not None:
+                report.results.append(PushResult(line_no, nom_station, script_type, f"{address[0]}:{address[1]}",
+                                                 False, f"Non envoyé : échec du script {failed}", skipped=True))
+                continue
+            result = await _push_one(pool, line_no, nom_station, script_type, address, script_content, options)
+            report.results.append(result)
+            if not result.ok:
+                failed = script_type
+
+
+async def push_sites(rows, techno="Les trois", node=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                     retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, minimal=False, combine=False):
+    """
+    Génère et envoie les scripts de chaque site à son nœud.
+    Args:
+        rows (iterable): Tuples (numéro de ligne, site), par exemple issus de load_inventory.
+        techno (str): Technologie par défaut.
+        node (str): Adresse utilisée pour les sites sans colonne node_address.
+        concurrency (int): Nombre maximal de sites traités simultanément.
+        timeout (float): Délai maximal d'une connexion ou d'une réponse.
+        retries (int): Nombre de nouvelles tentatives après un échec de transport.
+        backoff (float): Attente avant la première nouvelle tentative (doublée à chaque essai).
+        minimal (bool): Envoie les scripts sous forme minimale.
+        combine (bool): Envoie une seule transaction par site.
+    Returns:
+        PushReport: Bilan de l'envoi.
+    """
+    start = time.perf_counter()
+    report = PushReport()
+    pool = SessionPool(timeout)
+    options = {"timeout": timeout, "retries": retries, "backoff": backoff}
+    queue = asyncio.Queue(maxsize=concurrency * 2)  # File bornée : mémoire constante quel que soit l'inventaire
+    workers = [asyncio.create_task(_worker(queue, pool, report, options)) for _ in range(concurrency)]
+    addresses = {}                  # Numéro de ligne -> adresse, pour les sites en cours de génération
+
+    def _rows():
+        for line_no, site in rows:
+            addresses[line_no] = site.get(ADDRESS_FIELD) or node
+            yield line_no, site
+
+    try:
+        for line_no, nom_station, scripts, error in iter_generated(_rows(), techno, workers=1,
+                                                                   minimal=minimal, combine=combine):
+            report.sites += 1
+            address = addresses.pop(line_no)
+            if error is None and not address:
+                error = f"Adresse du nœud manquante (colonne {ADDRESS_FIELD} ou option --node)"
+            elif error is None:
+                try:
+                    address = parse_address(address)
+                except ValueError as e:
+                    error = str(e)
+            await queue.put((line_no, nom_station, scripts, error, address))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        await pool.close()
+
+    report.committed = sum(1 for result in report.results if result.ok)
+    report.skipped = sum(1 for result in report.results if result.skipped)
+    report.failed = len(report.results) - report.committed - report.skipped
+    report.connections = pool.opened
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def push_inventory(inventory_path, techno="Les trois", **options):
+    """
+    Envoie les scripts de tous les sites d'un inventaire (voir push_sites pour les options).
+    Les lignes illisibles de l'inventaire sont rapportées comme des échecs.
+    Returns:
+        PushReport: Bilan de l'envoi.
+    """
+    read_errors = []
+    report = asyncio.run(push_sites(load_inventory(inventory_path, read_errors), techno, **options))
+    for error in read_errors:
+        report.results.append(PushResult(error.line, error.nom_station, "", "", False, error.message))
+    report.sites += len(read_errors)
+    report.failed += len(read_errors)
+    return report
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : python push.py inventaire.csv [--node hôte:port]"""
+    parser = argparse.ArgumentParser(description="Envoie les scripts SIU d'un inventaire aux nœuds.")
+    parser.add_argument("inventory", help="Inventaire des sites (.csv ou .jsonl)")
+    parser.add_argument("-t", "--techno", default="Les trois", choices=TECHNOLOGIES, help="Technologie par défaut")
+    parser.add_argument("--node", default=None, help=f"Nœud des sites sans colonne {ADDRESS_FIELD} (hôte:port)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Sites traités simultanément (défaut : {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Délai maximal par échange (secondes)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Nouvelles tentatives après un échec")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF, help="Attente avant une nouvelle tentative")
+    parser.add_argument("--minimal", action="store_true", help="Envoie les scripts sous forme minimale")
+    parser.add_argument("--combine", action="store_true", help="Une seule transaction par site")
+    parser.add_argument("--report", default=None, help="Écrit le résultat de chaque commit dans un fichier JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        report = push_inventory(args.inventory, args.techno, node=args.node, concurrency=args.concurrency,
+                                timeout=args.timeout, retries=args.retries, backoff=args.backoff,
+                                minimal=args.minimal, combine=args.combine)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    for result in report.results:
+        if not result.ok:
+            print(f"Ligne {result.line} ({result.nom_station or '?'}) {result.script_type} -> {result.address} : "
+                  f"{result.message}", file=sys.stderr)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+    rate = report.sites / report.elapsed if report.elapsed else 0.0
+    print(f"{report.sites} sites, {report.committed} scripts validés, {report.failed} échecs, "
+          f"{report.skipped} non envoyés "
+          f"en {report.elapsed:.1f} s ({rate:.0f} sites/s, {report.connections} connexions)")
+    return 1 if report.failed or report.skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# Destinations d'écriture des scripts générés : dossier (éventuellement réparti par hachage), archive zip ou tar
+# Chaque script est écrit dès qu'il est produit, puis libéré ; seuls les noms déjà attribués sont conservés
+# (quelques dizaines d'octets par fichier), ainsi que le répertoire central d'une archive zip.
+import hashlib                      # Pour répartir les fichiers dans des sous-dossiers
+import io
+import os                           # Pour gérer les fichiers et chemins
+import re                           # Pour nettoyer les noms de fichiers
+import tarfile
+import time
+import zipfile
+
+BUFFER_SIZE = 1 << 20               # Taille du tampon d'écriture des archives (1 Mo)
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")  # Caractères interdits dans un nom de fichier
+
+
+def script_filename(nom_station, script_type, line_no=None):
+    """
+    Construit le nom de fichier d'un site et d'une technologie (ex. siu_MDN001_4G.txt).
+    Args:
+        nom_station (str): Nom de la station.
+        script_type (str): Type de script ("2G3G" ou "4G").
+        line_no (int): Numéro de ligne dans l'inventaire, qui nomme les sites sans station (ex. siu_ligne12_4G.txt).
+    Returns:
+        str: Nom de fichier sans caractères dangereux.
+    """
+    name = _UNSAFE_CHARS.sub("_", nom_station)
+    if not name:
+        name = f"ligne{line_no}" if line_no is not None else "sans_nom"
+    return f"siu_{name}_{script_type}.txt"
+
+
+def _fsync_dir(path):
+    """Force l'écriture sur disque de l'entrée d'un dossier (sans effet sous Windows)."""
+    if os.name != "nt":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class _AtomicFile:
+    """
+    Fichier écrit sous un nom temporaire puis renommé à la fermeture : en cas d'arrêt brutal,
+    le fichier final est soit absent, soit complet.
+    Args:
+        path (str): Chemin final du fichier.
+        atomic (bool): Si False, écrit directement dans le fichier final.
+        mode (str): Mode d'ouverture ("wb" pour les archives, "w" pour les scripts texte).
+    """
+
+    def __init__(self, path, atomic=True, mode="wb"):
+        self.path = path
+        self.atomic = atomic
+        self._tmp_path = os.path.join(os.path.dirname(path) or ".", f".{os.path.basename(path)}.tmp") if atomic else path
+        self.file = open(self._tmp_path, mode, buffering=BUFFER_SIZE)
+
+    def commit(self):
+        """Vide les tampons, synchronise le disque et donne au fichier son nom définitif."""
+        self.file.flush()
+        if self.atomic:
+            os.fsync(self.file.fileno())
+        self.file.close()
+        if self.atomic:
+            os.replace(self._tmp_path, self.path)
+            _fsync_dir(os.path.dirname(self.path) or ".")
+
+    def abort(self):
+        """Abandonne l'écriture et supprime le fichier temporaire."""
+        self.file.close()
+        if self.atomic:
+            try:
+                os.remove(self._tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+class Sink:
+    """Destination de scripts ; s'utilise comme gestionnaire de contexte."""
+
+    def __init__(self):
+        # Noms pris, en minuscules (systèmes de fichiers insensibles à la casse) -> station à laquelle le nom
+        # est réservé par une génération précédente, ou None si le nom a été écrit pendant cette génération
+        self._written = {}
+
+    def write(self, name, content):
+        """Écrit le contenu d'un script sous le nom donné."""
+        raise NotImplementedError
+
+    def reserve(self, name, nom_station):
+        """
+        Réserve le nom d'un fichier produit par une génération précédente (régénération incrémentale) :
+        seule la station à laquelle il a été attribué peut le réécrire.
+        """
+        self._written.setdefault(name.lower(), nom_station)
+
+    def write_script(self, nom_station, script_type, content, line_no=None, previous=()):
+        """
+        Écrit un script généré sous un nom dérivé de la station et de la technologie.
+        Si ce nom est déjà pris par un autre site (noms identiques après nettoyage des caractères),
+        le numéro de ligne de l'inventaire lui est ajouté (ex. siu_A_B_4G_ligne12.txt) : aucun script n'est écrasé.
+        Un site régénéré reprend le nom qui lui avait été attribué (previous), s'il lui est réservé.
+        Args:
+            nom_station (str): Nom de la station.
+            script_type (str): Type de script ("2G3G" ou "4G").
+            content (str): Contenu du script.
+            line_no (int): Numéro de ligne du site dans l'inventaire.
+            previous (iterable): Noms des fichiers produits pour ce site lors de la génération précédente.
+        Returns:
+            str: Nom sous lequel le script a été écrit.
+        """
+        name = script_filename(nom_station, script_type, line_no)
+        base = name[:-len(".txt")]
+        for old in previous:
+            if (old == name or old.startswith(f"{base}_ligne")) and self._written.get(old.lower()) == nom_station:
+                name = old
+                break
+        else:
+            if name.lower() in self._written and self._written[name.lower()] != nom_station:
+                base = f"{base}_ligne{line_no if line_no is not None else len(self._written)}"
+                name, n = f"{base}.txt", 2
+                while name.lower() in self._written:
+                    name, n = f"{base}_{n}.txt", n + 1
+        self._written[name.lower()] = None
+        self.write(name, content)
+        return name
+
+    def close(self):
+        """Termine l'écriture (valide l'archive le cas échéant)."""
+
+    def abort(self):
+        """Interrompt l'écriture après une erreur."""
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class DirectorySink(Sink):
+    """
+    Écrit chaque script dans un fichier d'un dossier.
+    Args:
+        root (str): Dossier de destination.
+        shard (bool): Répartit les fichiers dans des sous-dossiers ab/cd/ selon le hachage de leur nom,
+            pour éviter des dossiers de plusieurs dizaines de milliers de fichiers.
+        atomic (bool): Écrit chaque fichier sous un nom temporaire, fsync puis renommage.
+    """
+
+    def __init__(self, root, shard=False, atomic=False):
+        super().__init__()
+        self.root = root
+        self.shard = shard
+        self.atomic = atomic
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, name):
+        """Retourne le chemin du fichier correspondant à un nom de script."""
+        if not self.shard:
+            return os.path.join(self.root, name)
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], name)
+
+    def write(self, name, content):
+        path = self.path_for(name)
+        if self.shard:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        out = _AtomicFile(path, self.atomic, "w")  # Même mode texte que la sauvegarde depuis la GUI
+        try:
+            out.file.write(content)
+        except BaseException:
+            out.abort()
+            raise
+        out.commit()
+
+
+class ZipSink(Sink):
+    """
+    Écrit les scripts dans une archive zip (compressée), au fil de l'eau.
+    Le format zip impose d'écrire en fin d'archive le répertoire central de tous les fichiers : zipfile en
+    conserve une entrée par script jusqu'à la fermeture, la mémoire croît donc avec le nombre de scripts.
+    Pour de très gros inventaires, préférer un dossier ou une archive tar.
+    Args:
+        path (str): Chemin de l'archive.
+        atomic (bool): Construit l'archive sous un nom temporaire et ne la renomme qu'une fois complète.
+    """
+
+    def __init__(self, path, atomic=False):
+        super().__init__()
+        self._out = _AtomicFile(path, atomic)
+        self._zip = zipfile.ZipFile(self._out.file, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, name, content):
+        self._zip.writestr(name, content)
+
+    def close(self):
+        self._zip.close()
+        self._out.commit()
+
+    def abort(self):
+        self._zip.close()
+        self._out.abort()
+
+
+class TarSink(Sink):
+    """
+    Écrit les scripts dans une archive tar, compressée en gzip si le nom se termine par .gz ou .tgz.
+    Les en-têtes déjà écrits ne sont pas conservés : la mémoire reste constante quel que soit le nombre de scripts.
+    Args:
+        path (str): Chemin de l'archive.
+        atomic (bool): Construit l'archive sous un nom temporaire et ne la renomme qu'une fois complète.
+    """
+
+    def __init__(self, path, atomic=False):
+        super().__init__()
+        mode = "w:gz" if path.lower().endswith((".gz", ".tgz")) else "w"
+        self._out = _AtomicFile(path, atomic)
+        self._tar = tarfile.open(fileobj=self._out.file, mode=mode)
+
+    def write(self, name, content):
+        data = content.encode()
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+        self._tar.members.clear()   # TarFile garde sinon chaque en-tête écrit, inutile en écriture seule
+
+    def close(self):
+        self._tar.close()
+        self._out.commit()
+
+    def abort(self):
+        self._tar.close()
+        self._out.abort()
+
+
+def is_archive(target):
+    """Indique si la destination est une archive (.zip, .tar, .tar.gz, .tgz) plutôt qu'un dossier."""
+    return target.lower().endswith((".zip", ".tar", ".tar.gz", ".tgz"))
+
+
+def open_sink(target, shard=False, atomic=False):
+    """
+    Choisit la destination d'après le chemin : archive .zip, archive .tar/.tar.gz/.tgz, sinon dossier.
+    Args:
+        target (str): Chemin de l'archive ou du dossier.
+        shard (bool): Répartition par hachage (dossier uniquement).
+        atomic (bool): Écriture atomique (fichier temporaire, fsync, renommage).
+    Returns:
+        Sink: Destination prête à recevoir les scripts.
+    """
+    lower = target.lower()
+    if lower.endswith(".zip"):
+        return ZipSink(target, atomic)
+    if lower.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarSink(target, atomic)
+    return DirectorySink(target, shard, atomic)
@@ -0,0 +1,109 @@
+# Point d'entrée en ligne de commande du générateur de scripts SIU : python -m siu <commande> [options]
+# Seuls argparse et sys sont importés au démarrage ; chaque commande charge ses modules à la demande,
+# pour un lancement rapide depuis cron ou une chaîne d'intégration continue.
+import sys
+
+USAGE = """Usage : python -m siu <commande> [options]
+
+Commandes :
+  render     Affiche les scripts d'un site donné en arguments champ=valeur
+  generate   Génère les scripts de tous les sites d'un inventaire (voir bulk.py)
+  validate   Valide un inventaire et détecte les conflits entre sites (voir validation.py)
+  allocate   Attribue les VLANs et adresses IP manquants d'un inventaire (voir allocator.py)
+  push       Envoie les scripts d'un inventaire aux nœuds (voir push.py)
+  lint       Vérifie des scripts existants : transactions, références, valeurs (voir linter.py)
+  gui        Ouvre l'interface graphique
+
+python -m siu <commande> --help affiche l'aide d'une commande.
+"""
+
+
+def render(argv):
+    """
+    Affiche sur la sortie standard les scripts d'un seul site.
+    Exemple : python -m siu render -t 4G port_number_4g=6 port_id=TN_B vlan_s1_up=10 vlan_s1_cp=11 vlan_enodeB_om=12
+    """
+    import argparse
+    from generation import build_scripts, TECHNOLOGIES
+
+    parser = argparse.ArgumentParser(prog="python -m siu render", description="Affiche les scripts d'un site.")
+    parser.add_argument("-t", "--techno", default="Les trois", choices=TECHNOLOGIES, help="Technologie")
+    parser.add_argument("--minimal", action="store_true", help="Script minimal (MO et attributs en double fusionnés)")
+    parser.add_argument("--combine", action="store_true", help="Une seule transaction minimale pour 2G/3G et 4G")
+    parser.add_argument("fields", nargs="*", metavar="champ=valeur", help="Valeurs des champs du site")
+    args = parser.parse_args(argv)
+
+    site = {}
+    for item in args.fields:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"argument invalide : {item} (attendu champ=valeur)")
+        site[name] = value
+    try:
+        scripts = build_scripts(site, args.techno)
+        if args.minimal or args.combine:
+            from mo_model import minimize_scripts
+            scripts = minimize_scripts(scripts, args.combine)
+    except ValueError as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 1
+    for _, script_content, _ in scripts:
+        sys.stdout.write(script_content)
+    return 0
+
+
+def generate(argv):
+    """Génère les scripts de tous les sites d'un inventaire."""
+    import bulk
+    return bulk.main(argv)
+
+
+def validate(argv):
+    """Valide un inventaire de sites."""
+    import validation
+    return validation.main(argv)
+
+
+def allocate(argv):
+    """Complète les VLANs et adresses IP manquants d'un inventaire."""
+    import allocator
+    return allocator.main(argv)
+
+
+def push(argv):
+    """Envoie les scripts de tous les sites d'un inventaire à leurs nœuds."""
+    import push as push_module
+    return push_module.main(argv)
+
+
+def lint(argv):
+    """Vérifie des scripts, dossiers de scripts ou archives."""
+    import linter
+    return linter.main(argv)
+
+
+def gui(argv):
+    """Ouvre l'interface graphique (charge tkinter)."""
+    import configuration_
+    configuration_.main()
+    return 0
+
+
+COMMANDS = {"render": render, "generate": generate, "validate": validate, "allocate": allocate, "push": push, "lint": lint, "gui": gui}
+
+
+def main(argv=None):
+    """Sélectionne la commande et lui transmet les arguments restants."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(USAGE, end="")
+        return 0 if argv else 2
+    command = COMMANDS.get(argv[0])
+    if command is None:
+        print(f"Commande inconnue : {argv[0]}\n\n{USAGE}", end="", file=sys.stderr)
+        return 2
+    return command(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
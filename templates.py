@@ -0,0 +1,230 @@
+# Modèles précompilés des scripts SIU
+# Chaque modèle est découpé une seule fois en morceaux statiques et en emplacements de paramètres ;
+# le rendu d'un site se fait ensuite en une seule concaténation (str.join).
+# Les valeurs communes à une région (serveurs NTP, passerelles, route Abis...) sont aussi des paramètres :
+# elles sont fixées une fois par profil (voir profiles.py et CompiledTemplate.bind).
+
+TEMPLATE_VERSION = 1                # À incrémenter à chaque modification du contenu des modèles
+
+
+def _parse(text):
+    """
+    Découpe le texte d'un modèle autour de ses paramètres {nom}.
+    (Analyse volontairement simple plutôt que string.Formatter, qui charge le module re au démarrage.)
+    Yields:
+        tuple: (texte statique, nom du paramètre suivant ou None à la fin du modèle).
+    """
+    position = 0
+    while True:
+        start = text.find("{", position)
+        if start < 0:
+            yield text[position:], None
+            return
+        end = text.find("}", start)
+        name = text[start + 1:end]
+        if end < 0 or not name.isidentifier():
+            raise ValueError(f"Paramètre de modèle invalide à la position {start}")
+        yield text[position:start], name
+        position = end + 1
+
+
+class CompiledTemplate:
+    """
+    Modèle de script compilé : liste de morceaux statiques et positions des paramètres.
+    Args:
+        text (str): Texte du modèle, les paramètres étant notés {nom}.
+    """
+    __slots__ = ("fields", "_parts", "_slots")
+
+    def __init__(self, text):
+        parts = []                  # Morceaux du script (les emplacements valent None)
+        slots = []                  # Tuples (position dans parts, nom du paramètre)
+        for literal, name in _parse(text):
+            if literal:
+                parts.append(literal)
+            if name is not None:
+                slots.append((len(parts), name))
+                parts.append(None)
+        self._parts = parts
+        self._slots = tuple(slots)
+        self.fields = frozenset(name for _, name in slots)  # Noms des paramètres attendus
+
+    def render(self, values):
+        """
+        Produit le script d'un site.
+        Args:
+            values (dict): Valeur (str) de chaque paramètre du modèle.
+        Returns:
+            str: Contenu du script.
+        """
+        parts = self._parts.copy()
+        for position, name in self._slots:
+            parts[position] = values[name]
+        return "".join(parts)
+
+    def bind(self, values):
+        """
+        Fixe une partie des paramètres (par exemple les constantes d'un profil) une fois pour toutes.
+        Args:
+            values (dict): Valeur (str) des paramètres à fixer ; les autres restent à fournir à render.
+        Returns:
+            CompiledTemplate: Modèle dont les morceaux statiques voisins sont fusionnés.
+        """
+        names = dict(self._slots)
+        parts, slots = [], []
+        for position, part in enumerate(self._parts):
+            if part is None:
+                name = names[position]
+                if name not in values:
+                    slots.append((len(parts), name))
+                    parts.append(None)
+                    continue
+                part = values[name]
+            if parts and parts[-1] is not None:
+                parts[-1] += part
+            elif part:
+                parts.append(part)
+        bound = CompiledTemplate.__new__(CompiledTemplate)
+        bound._parts = parts
+        bound._slots = tuple(slots)
+        bound.fields = frozenset(name for _, name in slots)
+        return bound
+
+
+# Modèle du script 2G/3G
+SCRIPT_2G3G = CompiledTemplate(
+    "endtransaction t\n\nstarttransaction t\n\n"  # Début de la transaction
+    "subscribe {management_ip} 1\n\n"  # Abonnement à l'adresse de gestion
+    "setmoattribute t stn=0 STN_Name {nom_station}\n"  # Définit le nom de la station
+    "setmoattribute t stn=0 promptprefix {nom_station}\n"  # Définit le préfixe du prompt
+    "setmoattribute t stn=0 depip_interface STN=0,ipinterface=SIU_OM\n"  # Interface IP dépendante
+    "setmoattribute t stn=0 STN_PGW_KeepalivePeriod 30\n"  # Période de keepalive
+    "setmoattribute t stn=0 STN_PGW_L2TP_MaxTransmissions 10\n"  # Max transmissions L2TP
+    "setmoattribute t stn=0 STN_PGW_L2TP_RetransmissionCap 4\n"  # Capacité de retransmission
+    "setmoattribute t stn=0 systemclocktimeserver {clock_server}\n"  # Serveur NTP principal
+    "setmoattribute t stn=0 wakeupdestination {management_ip}\n"  # Destination de réveil
+    "setmoattribute t stn=0 wakeupeventinterval 2\n\n"  # Intervalle d'événement de réveil
+
+    # Configuration de l'interface Ethernet RBS
+    "createmo t stn=0,EthernetInterface=RBS\n"
+    "setmoattribute t STN=0,EthernetInterface=RBS portnumber {port_number}\n"
+    "setmoattribute t STN=0,EthernetInterface=RBS portId TN_A\n\n"
+    # Configuration de l'interface Ethernet Metro
+    "createmo t stn=0,EthernetInterface=Metro\n"
+    "setmoattribute t STN=0,EthernetInterface=Metro port SFP\n"
+    "setmoattribute t STN=0,EthernetInterface=Metro portnumber 1\n"
+    "setmoattribute t STN=0,EthernetInterface=Metro portId TN_E\n\n"
+
+    # Création des bridges pour Iub et OM
+    "createmo t STN=0,bridge=Iub\n"
+    "createmo t STN=0,bridge=OM\n\n"
+    # Configuration du groupe VLAN pour RBS
+    "createmo t STN=0,VLANGroup=RBS\n"
+    "setmoattribute t STN=0,VLANGroup=RBS depLinkLayer STN=0,EthernetInterface=RBS\n"
+    "createmo t STN=0,VLANGroup=RBS,vlan=Iub\n"
+    "setmoattribute t STN=0,VLANGroup=RBS,vlan=Iub depbridge STN=0,bridge=Iub\n"
+    "setmoattribute t STN=0,VLANGroup=RBS,vlan=Iub tagvalue {iub_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=RBS,vlan=OM\n"
+    "setmoattribute t STN=0,VLANGroup=RBS,vlan=OM depbridge STN=0,bridge=OM\n"
+    "setmoattribute t STN=0,VLANGroup=RBS,vlan=OM tagvalue {om_vlan}\n\n"
+    # Configuration du groupe VLAN pour Metro
+    "createmo t STN=0,VLANGroup=Metro\n"
+    "setmoattribute t STN=0,VLANGroup=Metro depLinkLayer STN=0,EthernetInterface=Metro\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=Iub\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=Iub depbridge STN=0,bridge=Iub\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=Iub tagvalue {iub_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=OM\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=OM depbridge STN=0,bridge=OM\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=OM tagvalue {om_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=Abis\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=Abis tagvalue {abis_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=SIU_OM\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=SIU_OM tagvalue {siu_om_vlan}\n\n"
+    # Configuration de l'interface IP Abis
+    "createmo t stn=0,ipinterface=Abis\n"
+    "setmoattribute t stn=0,ipinterface=Abis deplinklayer STN=0,VLANGroup=Metro,vlan=Abis\n"
+    "setmoattribute t stn=0,ipinterface=Abis primaryip_address {abis_ip}\n"
+    "setmoattribute t stn=0,ipinterface=Abis primarysubnetmask {subnet_mask}\n\n"
+    # Configuration de l'interface IP SIU_OM
+    "createmo t stn=0,ipinterface=SIU_OM\n"
+    "setmoattribute t stn=0,ipinterface=SIU_OM deplinklayer STN=0,VLANGroup=Metro,vlan=SIU_OM\n"
+    "setmoattribute t stn=0,ipinterface=SIU_OM primaryip_address {siu_om_ip}\n"
+    "setmoattribute t stn=0,ipinterface=SIU_OM primarysubnetmask {subnet_mask}\n"
+    "setmoattribute t stn=0,ipinterface=SIU_OM defaultgateway {siu_om_gateway}\n\n"
+    # Configuration des interfaces E1/T1
+    "createmo t STN=0,e1t1interface=0\n"
+    "createmo t STN=0,e1t1interface=1\n\n"
+    # Configuration du TGTransport
+    "createmo t STN=0,tgtransport={tg_transport}\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport} pgw_ip_address {pgw_ip}\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport} depip_interface STN=0,ipinterface=Abis\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport} overloadreportinterval 10\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport} DSCP_L2TP_CP 51\n\n"
+    "createmo t stn=0,tgtransport={tg_transport},superchannel=0\n"
+    "createmo t stn=0,tgtransport={tg_transport},superchannel=1\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport},superchannel=0 depe1t1interface 0\n"
+    "setmoattribute t STN=0,tgtransport={tg_transport},superchannel=1 depe1t1interface 1\n\n"
+    # Configuration de la table de routage
+    "createmo t stn=0,routingtable=0,iproute=Abis\n"
+    "setmoattribute t stn=0,routingtable=0,iproute=Abis admdistance 2\n"
+    "setmoattribute t stn=0,routingtable=0,iproute=Abis destipsubnet {abis_route}\n"
+    "setmoattribute t stn=0,routingtable=0,iproute=Abis forwardinginterface STN=0,ipinterface=Abis\n"
+    "setmoattribute t stn=0,routingtable=0,iproute=Abis nexthopipaddress {abis_nexthop}\n\n"
+    # Configuration des serveurs NTP
+    "createmo t stn=0,synchronization=0,timeserver=NTP0\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP0 TS_IP_Address {ntp0_ip}\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP0 TS_priority 60\n"
+    "setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    "setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    "createmo t stn=0,synchronization=0,timeserver=NTP1\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP1 TS_IP_Address {ntp1_ip}\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP1 TS_priority 0\n"
+    "setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    "setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    "createmo t stn=0,synchronization=0,timeserver=NTP2\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP2 TS_IP_Address {ntp2_ip}\n"
+    "setmoattribute t STN=0,Synchronization=0,TimeServer=NTP2 TS_priority 50\n"
+    "setmoattribute t stn=0,synchronization=0 synchType timeserver\n"
+    "setmoattribute t STN=0,Synchronization=0 depIP_Interface STN=0,IPInterface=SIU_OM\n\n"
+    "commit t forcedcommit\n\n"  # Valide la transaction
+    "endtransaction t\n"  # Fin de la transaction
+)
+
+# Modèle du script 4G
+SCRIPT_4G = CompiledTemplate(
+    "endtransaction t\n\nstarttransaction t\n\n"  # Début de la transaction
+    # Configuration de l'interface Ethernet Enode_B
+    "createmo t stn=0,EthernetInterface=Enode_B\n"
+    "setmoattribute t STN=0,EthernetInterface=Enode_B portnumber {port_number}\n"
+    "setmoattribute t STN=0,EthernetInterface=Enode_B portId {port_id}\n\n"
+    # Création des bridges pour 4G
+    "createmo t STN=0,bridge=S1-UP\n"
+    "createmo t STN=0,bridge=EnodeB_OM\n"
+    "createmo t STN=0,bridge=S1-CP\n\n"
+    # Configuration du groupe VLAN pour Enode_B
+    "createmo t STN=0,VLANGroup=Enode_B\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B depLinkLayer STN=0,EthernetInterface=Enode_B\n"
+    "createmo t STN=0,VLANGroup=Enode_B,vlan=S1-UP\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-UP depbridge STN=0,bridge=S1-UP\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-UP tagvalue {s1_up_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Enode_B,vlan=S1-CP\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-CP depbridge STN=0,bridge=S1-CP\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=S1-CP tagvalue {s1_cp_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM depbridge STN=0,bridge=EnodeB_OM\n"
+    "setmoattribute t STN=0,VLANGroup=Enode_B,vlan=EnodeB_OM tagvalue {enodeb_om_vlan}\n\n"
+    # Configuration du groupe VLAN pour Metro
+    "createmo t STN=0,VLANGroup=Metro\n"
+    "setmoattribute t STN=0,VLANGroup=Metro depLinkLayer STN=0,EthernetInterface=Metro\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=S1-UP\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-UP depbridge STN=0,bridge=S1-UP\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-UP tagvalue {s1_up_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=S1-CP\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-CP depbridge STN=0,bridge=S1-CP\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=S1-CP tagvalue {s1_cp_vlan}\n\n"
+    "createmo t STN=0,VLANGroup=Metro,vlan=EnodeB_OM\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=EnodeB_OM depbridge STN=0,bridge=EnodeB_OM\n"
+    "setmoattribute t STN=0,VLANGroup=Metro,vlan=EnodeB_OM tagvalue {enodeb_om_vlan}\n\n"
+    "checkconsistency t\n\n"  # Vérifie la cohérence
+    "commit t\n"  # Valide le script
+)
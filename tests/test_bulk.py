@@ -0,0 +1,59 @@
+# Tests de la lecture des inventaires et de la génération en masse (bulk.py)
+import json
+
+import pytest
+
+from bulk import generate_bulk, load_inventory
+
+SITE_4G = {"nom_station": "S1", "techno": "4G", "port_number_4g": "6", "port_id": "TN_B",
+           "vlan_s1_up": "200", "vlan_s1_cp": "201", "vlan_enodeB_om": "202"}
+
+
+def write_jsonl(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_csv_separator_is_detected(tmp_path):
+    path = tmp_path / "inv.csv"
+    path.write_text("nom_station;port_id\n S1 ;TN_B\n", encoding="utf-8")
+    assert list(load_inventory(str(path))) == [(2, {"nom_station": "S1", "port_id": "TN_B"})]
+
+
+def test_jsonl_errors_are_collected(tmp_path):
+    path = tmp_path / "inv.jsonl"
+    write_jsonl(path, [json.dumps({"nom_station": "S1"}), "{pas du json", "[1, 2]", "", json.dumps({"nom_station": "S2"})])
+    errors = []
+    rows = list(load_inventory(str(path), errors))
+    assert [(line, site["nom_station"]) for line, site in rows] == [(1, "S1"), (5, "S2")]
+    assert [error.line for error in errors] == [2, 3]
+
+
+def test_jsonl_error_raises_without_error_list(tmp_path):
+    path = tmp_path / "inv.jsonl"
+    write_jsonl(path, [json.dumps({"nom_station": "S1"}), "{pas du json"])
+    with pytest.raises(ValueError):
+        list(load_inventory(str(path)))
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        list(load_inventory(str(tmp_path / "inv.xlsx")))
+
+
+def test_bulk_reports_unreadable_lines(tmp_path):
+    path = tmp_path / "inv.jsonl"
+    write_jsonl(path, [json.dumps(SITE_4G), "{pas du json"])
+    report = generate_bulk(str(path), str(tmp_path / "out"), workers=1)
+    assert (report.sites, report.generated, report.files) == (2, 1, 1)
+    assert [error.line for error in report.errors] == [2]
+    assert (tmp_path / "out" / "siu_S1_4G.txt").is_file()
+
+
+def test_bulk_without_cache_never_overwrites(tmp_path):
+    path = tmp_path / "inv.jsonl"
+    write_jsonl(path, [json.dumps(dict(SITE_4G, nom_station="A/B")), json.dumps(dict(SITE_4G, nom_station="A_B")),
+                       json.dumps(dict(SITE_4G, nom_station=""))])
+    report = generate_bulk(str(path), str(tmp_path / "out"), workers=1)
+    assert report.files == 3
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+        "siu_A_B_4G.txt", "siu_A_B_4G_ligne2.txt", "siu_ligne3_4G.txt"]
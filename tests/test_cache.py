@@ -0,0 +1,49 @@
+# Tests de la régénération incrémentale (bulk.py --cache)
+import json
+
+from bulk import generate_bulk
+
+HEADER = "nom_station;techno;port_number_4g;port_id;vlan_s1_up;vlan_s1_cp;vlan_enodeB_om\n"
+
+
+def write_inventory(path, rows):
+    path.write_text(HEADER + "".join(";".join(row) + "\n" for row in rows), encoding="utf-8")
+
+
+def test_unchanged_sites_are_not_regenerated(tmp_path):
+    inventory, output, manifest = tmp_path / "inv.csv", tmp_path / "out", tmp_path / "manifest.json"
+    write_inventory(inventory, [("S1", "4G", "6", "TN_B", "200", "201", "202")])
+    first = generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    second = generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    assert (first.generated, first.cached) == (1, 0)
+    assert (second.generated, second.cached) == (0, 1)
+
+
+def test_deleted_output_is_regenerated(tmp_path):
+    inventory, output, manifest = tmp_path / "inv.csv", tmp_path / "out", tmp_path / "manifest.json"
+    write_inventory(inventory, [("S1", "4G", "6", "TN_B", "200", "201", "202")])
+    generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    (output / "siu_S1_4G.txt").unlink()
+    report = generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    assert report.generated == 1
+    assert (output / "siu_S1_4G.txt").is_file()
+
+
+def test_regenerated_site_keeps_its_name_beside_cached_site(tmp_path):
+    # A/B et A_B donnent le même nom de fichier : seule A_B change entre les deux générations
+    inventory, output, manifest = tmp_path / "inv.csv", tmp_path / "out", tmp_path / "manifest.json"
+    write_inventory(inventory, [("A/B", "4G", "6", "TN_B", "200", "201", "202"),
+                                ("A_B", "4G", "6", "TN_B", "300", "301", "302")])
+    generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    assert sorted(p.name for p in output.iterdir()) == ["siu_A_B_4G.txt", "siu_A_B_4G_ligne3.txt"]
+
+    write_inventory(inventory, [("A/B", "4G", "6", "TN_B", "200", "201", "202"),
+                                ("A_B", "4G", "6", "TN_B", "400", "401", "402")])
+    report = generate_bulk(str(inventory), str(output), workers=1, cache_path=str(manifest))
+    assert (report.generated, report.cached) == (1, 1)
+    assert sorted(p.name for p in output.iterdir()) == ["siu_A_B_4G.txt", "siu_A_B_4G_ligne3.txt"]
+    assert "tagvalue 200" in (output / "siu_A_B_4G.txt").read_text(encoding="utf-8")
+    assert "tagvalue 400" in (output / "siu_A_B_4G_ligne3.txt").read_text(encoding="utf-8")
+
+    outputs = {nom: entry["outputs"] for nom, entry in json.loads(manifest.read_text(encoding="utf-8"))["sites"].items()}
+    assert outputs["A/B"] != outputs["A_B"]
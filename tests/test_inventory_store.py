@@ -0,0 +1,18 @@
+# Tests de l'inventaire en colonnes (inventory_store.py)
+from inventory_store import InventoryStore, write_store
+
+SITES = [
+    {"nom_station": "S1", "IUB_vlan_number": "100", "ABIS_primary_ip": "10.0.0.5", "port_number_2g3g": "7"},
+    {"nom_station": "S2", "IUB_vlan_number": "007", "ABIS_primary_ip": "10.0.0.05", "port_number_2g3g": ""},
+    {"nom_station": "S3", "IUB_vlan_number": "²", "ABIS_primary_ip": "x", "port_number_2g3g": "٣"},
+]
+
+
+def test_round_trip_keeps_values_exactly(tmp_path):
+    path = str(tmp_path / "inv.siuinv")
+    write_store(enumerate(SITES, start=2), path)
+    with InventoryStore(path) as store:
+        rows = list(store)
+    assert [line for line, _ in rows] == [2, 3, 4]
+    for (_, site), expected in zip(rows, SITES):
+        assert {name: site.get(name, "") for name in expected} == expected
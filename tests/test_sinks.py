@@ -0,0 +1,53 @@
+# Tests des destinations d'écriture (sinks.py) : noms de fichiers et collisions
+import tarfile
+import zipfile
+
+import pytest
+
+from sinks import DirectorySink, open_sink, script_filename
+
+
+def test_script_filename():
+    assert script_filename("MDN 001/A", "4G") == "siu_MDN_001_A_4G.txt"
+    assert script_filename("", "2G3G", 12) == "siu_ligne12_2G3G.txt"
+
+
+def test_colliding_names_get_line_number(tmp_path):
+    with DirectorySink(str(tmp_path)) as sink:
+        assert sink.write_script("A/B", "4G", "un", 2) == "siu_A_B_4G.txt"
+        assert sink.write_script("A_B", "4G", "deux", 3) == "siu_A_B_4G_ligne3.txt"
+        assert sink.write_script("a_b", "4G", "trois", 3) == "siu_a_b_4G_ligne3_2.txt"  # Casse ignorée
+    assert (tmp_path / "siu_A_B_4G.txt").read_text() == "un"
+    assert (tmp_path / "siu_A_B_4G_ligne3.txt").read_text() == "deux"
+
+
+def test_reserved_name_is_kept_for_its_station(tmp_path):
+    # Régénération incrémentale : A/B est inchangée, seule A_B est réécrite
+    with DirectorySink(str(tmp_path)) as sink:
+        sink.reserve("siu_A_B_4G.txt", "A/B")
+        sink.reserve("siu_A_B_4G_ligne3.txt", "A_B")
+        assert sink.write_script("A_B", "4G", "deux", 5, ["siu_A_B_4G_ligne3.txt"]) == "siu_A_B_4G_ligne3.txt"
+        assert sink.write_script("C", "4G", "trois", 6) == "siu_C_4G.txt"
+    assert not (tmp_path / "siu_A_B_4G.txt").exists()
+
+
+def test_reserved_name_is_not_taken_by_another_station(tmp_path):
+    with DirectorySink(str(tmp_path)) as sink:
+        sink.reserve("siu_A_B_4G.txt", "A/B")
+        assert sink.write_script("A_B", "4G", "deux", 3) == "siu_A_B_4G_ligne3.txt"
+        assert sink.write_script("A/B", "4G", "un", 2, ["siu_A_B_4G.txt"]) == "siu_A_B_4G.txt"
+
+
+@pytest.mark.parametrize("name", ["scripts.zip", "scripts.tar", "scripts.tar.gz"])
+def test_archives_contain_every_script(tmp_path, name):
+    path = str(tmp_path / name)
+    with open_sink(path) as sink:
+        sink.write_script("A/B", "4G", "un", 2)
+        sink.write_script("A_B", "4G", "deux", 3)
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+    else:
+        with tarfile.open(path) as archive:
+            names = archive.getnames()
+    assert sorted(names) == ["siu_A_B_4G.txt", "siu_A_B_4G_ligne3.txt"]
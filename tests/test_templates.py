@@ -0,0 +1,37 @@
+# Tests du rendu par modèles : identique, octet pour octet, à l'ancienne génération (benchmarks/legacy.py)
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from generation import build_scripts
+from legacy import legacy_script_2g3g, legacy_script_4g
+
+SITE = {
+    "nom_station": "MDN_ZARZIS_01", "port_number_2g3g": "7", "IUB_vlan_number": "1201", "OM_vlan_number": "1202",
+    "ABIS_vlan_number": "1203", "SIU_OM_vlan_number": "1204", "ABIS_primary_ip": "172.27.162.10",
+    "SIU_OM_primary_ip": "172.27.162.70", "TG_transport": "TG63",
+    "port_number_4g": "6", "port_id": "TN_B", "vlan_s1_up": "2201", "vlan_s1_cp": "2202", "vlan_enodeB_om": "2203",
+}
+LEGACY_2G3G = legacy_script_2g3g(nom_station="MDN_ZARZIS_01", port_number="7", iub_vlan="1201", om_vlan="1202",
+                                 abis_vlan="1203", siu_om_vlan="1204", abis_ip="172.27.162.10",
+                                 siu_om_ip="172.27.162.70", tg_transport="TG63")
+LEGACY_4G = legacy_script_4g(port_number="6", port_id="TN_B", s1_up_vlan="2201", s1_cp_vlan="2202",
+                             enodeb_om_vlan="2203")
+
+
+@pytest.mark.parametrize("techno, expected", [
+    ("2G/3G", [("2G3G", LEGACY_2G3G)]),
+    ("4G", [("4G", LEGACY_4G)]),
+    ("Les trois", [("2G3G", LEGACY_2G3G), ("4G", LEGACY_4G)]),
+])
+def test_default_profile_matches_legacy(techno, expected):
+    scripts = build_scripts(SITE, techno)
+    assert [(script_type, content) for script_type, content, _ in scripts] == expected
+
+
+def test_invalid_field_is_rejected():
+    with pytest.raises(ValueError):
+        build_scripts(dict(SITE, ABIS_primary_ip="256.1.1.1"), "2G/3G")
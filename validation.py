@@ -0,0 +1,249 @@
+# Validation en masse d'un inventaire de sites : contrôle des champs colonne par colonne
+# et détection des conflits entre sites (adresses IP en double, VLANs en collision sur le Metro)
+import argparse                     # Pour l'interface en ligne de commande
+import json                         # Pour l'export du rapport
+import re                           # Pour les analyseurs précompilés
+import sys                          # Pour le code de retour
+from dataclasses import asdict, dataclass, field
+
+from bulk import load_inventory
+from generation import fields_2g3g, fields_4g, is_valid_vlan, TECHNOLOGIES
+from profiles import load_profile, PROFILE_FIELD
+
+# Champs contrôlés par type de valeur
+VLAN_FIELDS = ["IUB_vlan_number", "OM_vlan_number", "ABIS_vlan_number", "SIU_OM_vlan_number",
+               "vlan_s1_up", "vlan_s1_cp", "vlan_enodeB_om"]
+IP_FIELDS = ["ABIS_primary_ip", "SIU_OM_primary_ip"]
+PORT_FIELDS = ["port_number_2g3g", "port_number_4g"]
+
+# VLANs transportés par le groupe VLAN Metro de chaque technologie (voir templates.py)
+METRO_VLANS = {
+    "2G/3G": ["IUB_vlan_number", "OM_vlan_number", "ABIS_vlan_number", "SIU_OM_vlan_number"],
+    "4G": ["vlan_s1_up", "vlan_s1_cp", "vlan_enodeB_om"],
+}
+SEGMENT_FIELD = "metro_segment"     # Colonne facultative : segment Metro partagé par plusieurs sites
+
+# Analyseurs précompilés
+_VALID_VLANS = frozenset(str(vlan) for vlan in range(1, 4095))  # Écritures canoniques des VLANs valides
+_IPV4 = re.compile(r"(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})")
+_INTEGER = re.compile(r"[+-]?\d+")
+
+
+@dataclass
+class FieldError:
+    """Champ manquant ou invalide dans une ligne de l'inventaire."""
+    line: int
+    nom_station: str
+    field: str
+    value: str
+    message: str
+
+
+@dataclass
+class Conflict:
+    """Valeur utilisée plusieurs fois alors qu'elle doit être unique."""
+    kind: str                       # "station", "ip" ou "vlan"
+    value: str
+    occurrences: list               # Liste de (numéro de ligne, nom de station, champ)
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    """Rapport complet de validation d'un inventaire."""
+    sites: int = 0
+    field_errors: list = field(default_factory=list)
+    conflicts: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        """True si aucun champ invalide et aucun conflit n'a été trouvé."""
+        return not self.field_errors and not self.conflicts
+
+    def to_dict(self):
+        """Retourne le rapport sous forme de dictionnaire (pour un export JSON)."""
+        return asdict(self)
+
+    def format(self):
+        """Retourne le rapport sous forme de texte lisible."""
+        lines = [f"Ligne {e.line} ({e.nom_station or '?'}) : {e.field} = {e.value!r} : {e.message}"
+                 for e in self.field_errors]
+        for conflict in self.conflicts:
+            where = ", ".join(f"ligne {line} ({nom or '?'}, {name})" for line, nom, name in conflict.occurrences)
+            lines.append(f"Conflit {conflict.kind} {conflict.value} : {conflict.message} : {where}")
+        lines.append(f"{self.sites} sites, {len(self.field_errors)} champs invalides, {len(self.conflicts)} conflits")
+        return "\n".join(lines)
+
+
+def parse_ip(value):
+    """
+    Convertit une adresse IPv4 en entier 32 bits.
+    Args:
+        value (str): Adresse IP (format xxx.xxx.xxx.xxx).
+    Returns:
+        int: Adresse sous forme d'entier, ou None si elle est invalide.
+    """
+    match = _IPV4.fullmatch(value)
+    if not match:
+        return None
+    a, b, c, d = map(int, match.groups())
+    if a > 255 or b > 255 or c > 255 or d > 255:
+        return None
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def format_ip(value):
+    """Convertit un entier 32 bits en adresse IPv4 (xxx.xxx.xxx.xxx)."""
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def parse_vlan(value):
+    """
+    Convertit un VLAN ID en entier (mêmes règles que is_valid_vlan).
+    Returns:
+        int: VLAN ID entre 1 et 4094, ou None s'il est invalide.
+    """
+    if value in _VALID_VLANS:       # Cas courant : écriture canonique, sans conversion
+        return int(value)
+    return int(value) if is_valid_vlan(value) else None
+
+
+_REQUIRED_FIELDS = {                # Champs obligatoires (et contrôlés) pour chaque technologie
+    "2G/3G": frozenset(fields_2g3g),
+    "4G": frozenset(fields_4g),
+    "Les trois": frozenset(fields_2g3g + fields_4g),
+}
+
+
+def validate_inventory(rows, techno="Les trois"):
+    """
+    Valide un inventaire complet en un seul passage linéaire et relève toutes les erreurs,
+    au lieu de s'arrêter à la première.
+    Contrôles par colonne : champs obligatoires, VLANs (1 à 4094), adresses IP, numéros de port, profil de région.
+    Contrôles entre sites (index par valeur) : noms de station en double, adresses IP Abis/SIU_OM
+    utilisées plusieurs fois, VLANs identiques sur le groupe Metro d'un même site ou d'un même
+    segment Metro (colonne facultative metro_segment).
+    Args:
+        rows (iterable): Tuples (numéro de ligne, site), par exemple issus de bulk.load_inventory.
+        techno (str): Technologie par défaut si le site ne précise pas la sienne.
+    Returns:
+        ValidationReport: Rapport listant chaque champ invalide et chaque conflit.
+    """
+    report = ValidationReport()
+
+    # Passage unique sur l'inventaire : construction des colonnes
+    lines, stations, technos, segments, profiles = [], [], [], [], []
+    columns = {name: [] for name in fields_2g3g + fields_4g}
+    for line_no, site in rows:
+        lines.append(line_no)
+        stations.append(site.get("nom_station", ""))
+        technos.append(site.get("techno") or techno)
+        segments.append(site.get(SEGMENT_FIELD, ""))
+        profiles.append(site.get(PROFILE_FIELD, ""))
+        for name, column in columns.items():
+            column.append(site.get(name, ""))
+    report.sites = len(lines)
+
+    def error(i, name, value, message):
+        report.field_errors.append(FieldError(lines[i], stations[i], name, value, message))
+
+    # Technologie et champs obligatoires (les champs d'une technologie non sélectionnée sont ignorés)
+    required = []
+    for i, site_techno in enumerate(technos):
+        if site_techno not in TECHNOLOGIES:
+            error(i, "techno", site_techno, "Technologie inconnue")
+        required.append(_REQUIRED_FIELDS.get(site_techno, frozenset()))
+    profile_errors = {}             # Nom du profil -> message d'erreur ou None (chaque profil n'est chargé qu'une fois)
+    for i, name in enumerate(profiles):
+        if name not in profile_errors:
+            try:
+                load_profile(name)
+                profile_errors[name] = None
+            except ValueError as e:
+                profile_errors[name] = str(e)
+        if profile_errors[name]:
+            error(i, PROFILE_FIELD, name, profile_errors[name])
+    for name, column in columns.items():
+        for i, value in enumerate(column):
+            if not value and name in required[i]:
+                error(i, name, value, "Champ obligatoire manquant")
+
+    # Contrôle des colonnes typées (les valeurs vides ont déjà été signalées)
+    vlans = {}                      # Champ -> liste des VLANs analysés (None si invalide ou vide)
+    for name in VLAN_FIELDS:
+        parsed = vlans[name] = [parse_vlan(value) if value else None for value in columns[name]]
+        for i, vlan in enumerate(parsed):
+            if vlan is None and columns[name][i] and name in required[i]:
+                error(i, name, columns[name][i], "Le VLAN doit être un entier entre 1 et 4094")
+    ips = {}                        # Champ -> liste des adresses analysées (entiers 32 bits)
+    for name in IP_FIELDS:
+        parsed = ips[name] = [parse_ip(value) if value else None for value in columns[name]]
+        for i, ip in enumerate(parsed):
+            if ip is None and columns[name][i] and name in required[i]:
+                error(i, name, columns[name][i], "Adresse IP invalide")
+    for name in PORT_FIELDS:
+        for i, value in enumerate(columns[name]):
+            if value and name in required[i] and not _INTEGER.fullmatch(value):
+                error(i, name, value, "Le numéro de port doit être un entier")
+
+    # Index par valeur : chaque valeur n'est vue qu'une fois, les doublons sont regroupés
+    station_index = {}
+    for i, nom in enumerate(stations):
+        if nom:
+            station_index.setdefault(nom, []).append((lines[i], nom, "nom_station"))
+    for nom, occurrences in station_index.items():
+        if len(occurrences) > 1:
+            report.conflicts.append(Conflict("station", nom, occurrences, "Nom de station en double"))
+
+    ip_index = {}
+    for name in IP_FIELDS:
+        for i, ip in enumerate(ips[name]):
+            if ip is not None and name in required[i]:
+                ip_index.setdefault(ip, []).append((lines[i], stations[i], name))
+    for ip, occurrences in ip_index.items():
+        if len(occurrences) > 1:
+            report.conflicts.append(Conflict("ip", format_ip(ip), occurrences, "Adresse IP attribuée plusieurs fois"))
+
+    # VLANs du groupe Metro : uniques par site, et par segment Metro lorsqu'il est renseigné
+    vlan_index = {}                 # (segment ou numéro de ligne, VLAN) -> occurrences
+    for i, site_techno in enumerate(technos):
+        scope = ("segment", segments[i]) if segments[i] else ("site", lines[i])
+        for group, names in METRO_VLANS.items():
+            if site_techno not in (group, "Les trois"):
+                continue
+            for name in names:
+                vlan = vlans[name][i]
+                if vlan is not None:
+                    vlan_index.setdefault((scope, vlan), []).append((lines[i], stations[i], name))
+    for ((kind, where), vlan), occurrences in vlan_index.items():
+        if len(occurrences) > 1:
+            message = f"VLAN utilisé plusieurs fois sur le segment Metro {where}" if kind == "segment" \
+                else "VLAN utilisé plusieurs fois sur le groupe Metro du site"
+            report.conflicts.append(Conflict("vlan", str(vlan), occurrences, message))
+
+    return report
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : python validation.py inventaire.csv"""
+    parser = argparse.ArgumentParser(description="Valide un inventaire de sites et détecte les conflits entre sites.")
+    parser.add_argument("inventory", help="Inventaire des sites (.csv ou .jsonl)")
+    parser.add_argument("-t", "--techno", default="Les trois", choices=TECHNOLOGIES, help="Technologie par défaut")
+    parser.add_argument("--json", action="store_true", help="Affiche le rapport au format JSON")
+    args = parser.parse_args(argv)
+
+    read_errors = []
+    try:
+        report = validate_inventory(load_inventory(args.inventory, read_errors), args.techno)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    if read_errors:                 # Lignes illisibles : signalées comme des champs invalides
+        report.sites += len(read_errors)
+        report.field_errors[:0] = [FieldError(e.line, "", "ligne", "", e.message) for e in read_errors]
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2) if args.json else report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())